@@ -3,7 +3,9 @@
 # Author: Valéry Febvre <vfebvre@easter-eggs.com>
 
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+from functools import cached_property
 from gettext import gettext as _
 import gi
 import logging
@@ -18,31 +20,22 @@ from gi.repository import Adw
 from gi.repository import Gdk
 from gi.repository import Gio
 from gi.repository import GLib
+from gi.repository import GObject
 from gi.repository import Gtk
 
-from komikku.card import CardPage
-from komikku.consts import CREDITS
-from komikku.consts import RELEASE_NOTES
-from komikku.categories_editor import CategoriesEditorPage
-from komikku.debug_info import DebugInfo
+from komikku.consts import get_credits
+from komikku.consts import RELEASE_NOTES_RESOURCE_PATH
 from komikku.downloader import Downloader
-from komikku.downloader import DownloadManagerPage
-from komikku.explorer import Explorer
-from komikku.history import HistoryPage
 from komikku.library import LibraryPage
 from komikku.models import backup_db
 from komikku.models import init_db
 from komikku.models import Settings
 from komikku.models.database import clear_cached_data
-from komikku.preferences import PreferencesDialog
-from komikku.reader import ReaderPage
 from komikku.servers import init_servers_modules
 from komikku.servers import install_servers_modules_from_repo
-from komikku.servers.utils import get_allowed_servers_list
-from komikku.support import SupportPage
+from komikku.servers.utils import get_allowed_servers_by_url
 from komikku.trackers import Trackers
 from komikku.updater import Updater
-from komikku.webview import WebviewPage
 
 BANNER = """
 ██╗  ██╗ ██████╗ ███╗   ███╗██╗██╗  ██╗██╗  ██╗██╗   ██╗
@@ -54,6 +47,10 @@ BANNER = """
 
 
 class Application(Adw.Application):
+    __gsignals__ = {
+        'db-ready': (GObject.SignalFlags.RUN_FIRST, None, ()),
+    }
+
     application_id = None
     author = None
     description = None
@@ -61,6 +58,7 @@ class Application(Adw.Application):
     profile = None
     version = None
 
+    db_ready = False
     logger = None
 
     def __init__(self):
@@ -68,6 +66,10 @@ class Application(Adw.Application):
 
         self.window = None
 
+        # Shared bounded pool for one-shot background jobs
+        # Jobs are mostly I/O bound: allow all trackers to be queried at once when tracking dialog is opened
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='komikku-bg')
+
         self.add_main_option_entries([])
         self.set_resource_base_path('/info/febvre/Komikku')
         GLib.set_application_name('Komikku')
@@ -103,11 +105,7 @@ class Application(Adw.Application):
 
         url = urls[0]
         servers = []
-        for data in get_allowed_servers_list(Settings.get_default()):
-            server_class = getattr(data['module'], data['class_name'])
-            if not server_class.base_url or not url.startswith(server_class.base_url):
-                continue
-
+        for data, server_class in get_allowed_servers_by_url(Settings.get_default(), url):
             if initial_data := server_class.get_manga_initial_data_from_url(url):
                 data['manga_initial_data'] = initial_data
                 servers.append(data)
@@ -124,17 +122,40 @@ class Application(Adw.Application):
     def do_startup(self):
         Adw.Application.do_startup(self)
 
-        init_db()
         init_servers_modules(Settings.get_default().external_servers_modules)
 
+        # DB checks and migrations are done once main window has been presented
+        GLib.idle_add(self.init_db, priority=GLib.PRIORITY_LOW)
+
+    def init_db(self):
+        init_db()
+
+        self.db_ready = True
+        self.emit('db-ready')
+
+        return GLib.SOURCE_REMOVE
+
 
 @Gtk.Template.from_resource('/info/febvre/Komikku/ui/application_window.ui')
 class ApplicationWindow(Adw.ApplicationWindow):
     __gtype_name__ = 'ApplicationWindow'
 
+    # Application actions: name, handler method name, accelerators
+    ACTIONS = (
+        ('about', 'on_about_menu_clicked', ()),
+        ('enter-search-mode', 'enter_search_mode', ('<Primary>f',)),
+        ('fullscreen', 'toggle_fullscreen', ('F11',)),
+        ('select-all', 'select_all', ('<Primary>a',)),
+        ('preferences', 'on_preferences_menu_clicked', ('<Primary>comma',)),
+        ('shortcuts', 'on_shortcuts_menu_clicked', ('<Primary>question',)),
+        ('support', 'open_support', ()),
+        ('quit', 'quit', ('<Primary>q', '<Primary>w')),
+    )
+
     network_available = False
     last_navigation_action = None
     external_servers_modules_update_at_startup_done = False
+    install_servers_modules_future = None
 
     overlay = Gtk.Template.Child('overlay')
     navigationview = Gtk.Template.Child('navigationview')
@@ -147,21 +168,27 @@ class ApplicationWindow(Adw.ApplicationWindow):
 
     notification_active = False
     notification_queue = deque()
+    notification_source_id = None
     notification_timer = None
+    resize_maximized_pending = False
+    resize_timeout_id = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.application = kwargs['application']
 
+        self._settings = Settings.get_default()
+        self._style_manager = Adw.StyleManager.get_default()
+
+        self._monitor = None
+        self._monitor_width = None
+        self._page_tag = None
+        self._previous_page_tag = None
         self._night_light_handler_id = 0
         self._night_light_proxy = None
-
-        self.builder = Gtk.Builder()
-        self.builder.add_from_resource('/info/febvre/Komikku/ui/menu/main.xml')
-
-        self.css_provider = Gtk.CssProvider.new()
-        Gtk.StyleContext.add_provider_for_display(Gdk.Display.get_default(), self.css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        self._night_light_proxy_requested = False
+        self._webview = None
 
         self.activity_indicator = Adw.Spinner(
             halign=Gtk.Align.CENTER, valign=Gtk.Align.CENTER, width_request=48, height_request=48, visible=False
@@ -173,77 +200,189 @@ class ApplicationWindow(Adw.ApplicationWindow):
         self.updater = Updater(self)
 
         self.assemble_window()
-        self.add_accelerators()
         self.add_actions()
 
-        Gio.NetworkMonitor.get_default().connect('network-changed', self.on_network_status_changed)
-        # Non-portal implementations of Gio.NetworkMonitor (app not running under Flatpak) don't actually change the value
-        # unless the network state actually changes
-        Gio.NetworkMonitor.get_default().emit('network-changed', None)
+        # Everything that requires DB is postponed until DB is ready
+        if self.application.db_ready:
+            self.on_db_ready()
+        else:
+            self.application.connect('db-ready', self.on_db_ready)
 
     @property
     def page(self):
-        return self.navigationview.get_visible_page().props.tag
+        return self._page_tag
 
     @property
     def previous_page(self):
-        previous_page = self.navigationview.get_previous_page(self.navigationview.get_visible_page())
-        return previous_page.props.tag if previous_page else None
+        return self._previous_page_tag
 
     @property
     def monitor(self):
-        return self.get_display().get_monitor_at_surface(self.get_native().get_surface())
+        if self._monitor is None:
+            self._monitor = self.get_display().get_monitor_at_surface(self.get_native().get_surface())
 
-    def add_accelerators(self):
-        self.application.set_accels_for_action('app.add', ['<Primary>plus'])
-        self.application.set_accels_for_action('app.enter-search-mode', ['<Primary>f'])
-        self.application.set_accels_for_action('app.fullscreen', ['F11'])
-        self.application.set_accels_for_action('app.select-all', ['<Primary>a'])
-        self.application.set_accels_for_action('app.preferences', ['<Primary>comma'])
-        self.application.set_accels_for_action('app.shortcuts', ['<Primary>question'])
-        self.application.set_accels_for_action('app.quit', ['<Primary>q', '<Primary>w'])
+        return self._monitor
 
-        self.library.add_accelerators()
-        self.reader.add_accelerators()
+    @property
+    def monitor_width(self):
+        """Width of monitor in logical pixels"""
+        if self._monitor_width is None:
+            # Window must be realized (surface is required)
+            self._monitor_width = self.monitor.props.geometry.width / self.get_native().get_surface().get_scale()
 
-    def add_actions(self):
-        about_action = Gio.SimpleAction.new('about', None)
-        about_action.connect('activate', self.on_about_menu_clicked)
-        self.application.add_action(about_action)
+        return self._monitor_width
+
+    # Pages and dialogs are instantiated (and their modules imported) on first use
+    # Only the library page is needed to display the first frame
+
+    @cached_property
+    def about_dialog(self):
+        dialog = Adw.AboutDialog.new_from_appdata('/info/febvre/Komikku/metainfo.xml', self.application.version)
+
+        dialog.set_copyright(f'© 2019-{datetime.date.today().year} {self.application.author} et al.')
+        dialog.set_comments(_("""A manga, webtoons and comics reader
+
+👉 Never forget, you can support the authors
+by buying the official comics when they are
+available in your region/language."""))
+        credits = get_credits()
+        dialog.set_artists(credits['artists'])
+        dialog.set_designers(credits['designers'])
+        dialog.set_developers(credits['developers'])
+        dialog.set_translator_credits('\n'.join(credits['translators']))
+        dialog.add_acknowledgement_section(_('Supporters'), credits['supporters'])
+        dialog.set_support_url('https://matrix.to/#/#komikku-gnome:matrix.org')
+        dialog.add_link(_('Join Chat'), 'https://matrix.to/#/#komikku-gnome:matrix.org')
+
+        # Override release notes
+        release_notes = Gio.resources_lookup_data(RELEASE_NOTES_RESOURCE_PATH, Gio.ResourceLookupFlags.NONE)
+        dialog.set_release_notes(release_notes.get_data().decode())
+
+        dialog.set_debug_info_filename('Komikku-debug-info.txt')
+
+        return dialog
+
+    @cached_property
+    def builder(self):
+        # Shared builder: pages add their menus resources to it (main menu is loaded by library page)
+        return Gtk.Builder()
+
+    @cached_property
+    def card(self):
+        from komikku.card import CardPage
+
+        card = CardPage(self)
+        card.add_actions()
 
-        enter_search_mode_action = Gio.SimpleAction.new('enter-search-mode', None)
-        enter_search_mode_action.connect('activate', self.enter_search_mode)
-        self.application.add_action(enter_search_mode_action)
+        return card
 
-        fullscreen_action = Gio.SimpleAction.new('fullscreen', None)
-        fullscreen_action.connect('activate', self.toggle_fullscreen)
-        self.application.add_action(fullscreen_action)
+    @cached_property
+    def categories_editor(self):
+        from komikku.categories_editor import CategoriesEditorPage
 
-        self.select_all_action = Gio.SimpleAction.new('select-all', None)
-        self.select_all_action.connect('activate', self.select_all)
-        self.application.add_action(self.select_all_action)
+        return CategoriesEditorPage(self)
 
-        preferences_action = Gio.SimpleAction.new('preferences', None)
-        preferences_action.connect('activate', self.on_preferences_menu_clicked)
-        self.application.add_action(preferences_action)
+    @cached_property
+    def css_provider(self):
+        css_provider = Gtk.CssProvider.new()
+        Gtk.StyleContext.add_provider_for_display(Gdk.Display.get_default(), css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
 
-        shortcuts_action = Gio.SimpleAction.new('shortcuts', None)
-        shortcuts_action.connect('activate', self.on_shortcuts_menu_clicked)
-        self.application.add_action(shortcuts_action)
+        return css_provider
 
-        support_action = Gio.SimpleAction.new('support', None)
-        support_action.connect('activate', self.open_support)
-        self.application.add_action(support_action)
+    @cached_property
+    def download_manager(self):
+        from komikku.downloader import DownloadManagerPage
 
-        quit_action = Gio.SimpleAction.new('quit', None)
-        quit_action.connect('activate', self.quit)
-        self.application.add_action(quit_action)
+        download_manager = DownloadManagerPage(self)
+        download_manager.add_actions()
 
-        self.explorer.search_page.add_actions()
+        return download_manager
+
+    @cached_property
+    def explorer(self):
+        from komikku.explorer import Explorer
+
+        explorer = Explorer(self)
+        explorer.search_page.add_actions()
+
+        return explorer
+
+    @cached_property
+    def history(self):
+        from komikku.history import HistoryPage
+
+        return HistoryPage(self)
+
+    @cached_property
+    def preferences(self):
+        from komikku.preferences import PreferencesDialog
+
+        return PreferencesDialog(self)
+
+    @cached_property
+    def reader(self):
+        from komikku.reader import ReaderPage
+
+        reader = ReaderPage(self)
+        reader.add_accelerators()
+        reader.add_actions()
+
+        return reader
+
+    @cached_property
+    def shortcuts_dialog(self):
+        builder = Gtk.Builder()
+        builder.add_from_resource('/info/febvre/Komikku/ui/shortcuts.ui')
+
+        return builder.get_object('shortcuts_dialog')
+
+    @cached_property
+    def support(self):
+        from komikku.support import SupportPage
+
+        return SupportPage(self)
+
+    @property
+    def webview(self):
+        # Webview is also requested from servers and trackers worker threads (challenges, JS evaluation, OAuth)
+        # but, like any widget, it must be instantiated in main thread
+        if self._webview is None:
+            if threading.current_thread() is threading.main_thread():
+                self.init_webview()
+            else:
+                error = None
+                event = threading.Event()
+
+                def init():
+                    nonlocal error
+
+                    try:
+                        if self._webview is None:
+                            self.init_webview()
+                    except Exception as e:
+                        error = e
+                    finally:
+                        # Calling thread must never stay blocked
+                        event.set()
+
+                GLib.idle_add(init)
+                event.wait()
+
+                if error is not None:
+                    raise error
+
+        return self._webview
+
+    def add_actions(self):
+        for name, handler_name, accels in self.ACTIONS:
+            action = Gio.SimpleAction.new(name, None)
+            action.connect('activate', getattr(self, handler_name))
+            self.application.add_action(action)
+            if accels:
+                self.application.set_accels_for_action(f'app.{name}', list(accels))
+
+        self.library.add_accelerators()
         self.library.add_actions()
-        self.card.add_actions()
-        self.reader.add_actions()
-        self.download_manager.add_actions()
 
     def add_notification(self, message, timeout=5, priority=0):
         # We use a custom in-app notification solution (Gtk.Revealer)
@@ -255,17 +394,20 @@ class ApplicationWindow(Adw.ApplicationWindow):
             'timeout': timeout,
         }
 
+        # Queue is consumed from the right: high priority notifications jump the queue, others are FIFO
         if priority == 1:
             self.notification_queue.append(item)
         else:
             self.notification_queue.appendleft(item)
 
-        GLib.idle_add(self.show_notification)
+        self.schedule_notification()
 
     def assemble_window(self):
+        settings = self._settings
+
         # Restore window previous state (width/height and maximized) or use default
-        self.set_default_size(*Settings.get_default().window_size)
-        if Settings.get_default().window_maximized_state:
+        self.set_default_size(*settings.window_size)
+        if settings.window_maximized_state:
             self.maximize()
 
         self.set_size_request(360, 288)
@@ -277,6 +419,12 @@ class ApplicationWindow(Adw.ApplicationWindow):
         self.connect('notify::maximized', self.on_resize)
         self.connect('close-request', self.quit)
 
+        # Cached monitor (and its width) is invalidated when monitors change, when window enters another monitor
+        # or when surface scale changes
+        self.get_display().get_monitors().connect('items-changed', self.on_monitor_changed)
+        self.connect('realize', self.on_realize)
+
+        self.navigationview.connect('notify::visible-page', self.on_navigation_visible_page_changed)
         self.navigationview.connect('popped', self.on_navigation_popped)
         self.navigationview.connect('pushed', self.on_navigation_pushed)
 
@@ -290,20 +438,24 @@ class ApplicationWindow(Adw.ApplicationWindow):
         self.add_controller(self.gesture_click)
 
         self.banner.connect('button-clicked', self.on_banner_button_clicked)
+        self.notification_revealer.connect('notify::child-revealed', self.on_notification_child_revealed_changed)
 
         # Init pages
+        # Other pages and dialogs are lazily instantiated, see cached properties
         self.library = LibraryPage(self)
-        self.card = CardPage(self)
-        self.reader = ReaderPage(self)
-        self.categories_editor = CategoriesEditorPage(self)
-        self.download_manager = DownloadManagerPage(self)
-        self.explorer = Explorer(self)
-        self.history = HistoryPage(self)
-        self.support = SupportPage(self)
-        self.webview = WebviewPage(self)
-
-        # Init dialogs
-        self.preferences = PreferencesDialog(self)
+
+        # Page aware actions, indexed by page tag
+        # Lambdas preserve pages laziness: a page necessarily exists when it's the visible one
+        self.searchbars_getters = {
+            'library': lambda: self.library.searchbar,
+            'explorer.servers': lambda: self.explorer.servers_page.searchbar,
+            'history': lambda: self.history.searchbar,
+        }
+        self.select_all_handlers = {
+            'library': lambda: self.library.select_all(),
+            'card': lambda: self.card.chapters_list.select_all(),
+            'download-manager': lambda: self.download_manager.select_all(),
+        }
 
         if self.application.profile in ('beta', 'development'):
             self.add_css_class('devel')
@@ -311,64 +463,99 @@ class ApplicationWindow(Adw.ApplicationWindow):
         # Theme (light or dark) and accent colors
         self.init_theme()
         self.init_accent_colors()
-        Adw.StyleManager.get_default().connect('notify::accent-color', lambda _sm, _p: self.init_accent_colors())
-
-        GLib.idle_add(self.library.populate)
+        self._style_manager.connect('notify::accent-color', lambda _sm, _p: self.init_accent_colors())
 
     def enter_search_mode(self, _action, _param):
-        if self.page == 'library':
-            searchbar = self.library.searchbar
-        elif self.page == 'explorer.servers':
-            searchbar = self.explorer.servers_page.searchbar
-        elif self.page == 'history':
-            searchbar = self.history.searchbar
+        if get_searchbar := self.searchbars_getters.get(self.page):
+            searchbar = get_searchbar()
+            searchbar.set_search_mode(not searchbar.get_search_mode())
 
-        searchbar.set_search_mode(not searchbar.get_search_mode())
+    def flush_resize(self):
+        def on_maximized():
+            # Gtk.Window::maximized (idem with Gdk.Toplevel:state) event is unreliable because it's emitted too earlier
+            # We detect that maximization is effective by comparing monitor size and window size
+            if self.get_width() < self.monitor_width and self.is_maximized():
+                return True
+
+            self.library.on_resize()
+
+        self.resize_timeout_id = None
+
+        if self.resize_maximized_pending:
+            self.resize_maximized_pending = False
+            GLib.idle_add(on_maximized)
+        else:
+            self.library.on_resize()
+
+        return GLib.SOURCE_REMOVE
 
     def hide_notification(self):
+        self.notification_timer = None
         self.notification_active = False
+        # Next notification (if any) is shown once revealer is fully hidden, see on_notification_child_revealed_changed
         self.notification_revealer.set_reveal_child(False)
 
-        GLib.idle_add(self.show_notification)
+        return GLib.SOURCE_REMOVE
 
     def init_accent_colors(self):
-        if Adw.StyleManager.get_default().get_system_supports_accent_colors() and Settings.get_default().system_accent_colors:
+        if self._style_manager.get_system_supports_accent_colors() and self._settings.system_accent_colors:
             self.css_provider.load_from_string('')
         else:
             self.css_provider.load_from_string(':root {--accent-bg-color: var(--red-1); --accent-color: oklab(from var(--accent-bg-color) var(--standalone-color-oklab));}')
 
     def init_theme(self):
         def set_color_scheme():
-            if ((self._night_light_proxy.get_cached_property('NightLightActive') and Settings.get_default().night_light)
-                    or Settings.get_default().color_scheme == 'dark'):
+            settings = self._settings
+            scheme = settings.color_scheme
+            # Night light is considered inactive until proxy is ready
+            night_light_active = self._night_light_proxy and self._night_light_proxy.get_cached_property('NightLightActive')
+
+            if (night_light_active and settings.night_light) or scheme == 'dark':
                 color_scheme = Adw.ColorScheme.FORCE_DARK
-            elif Settings.get_default().color_scheme == 'light':
+            elif scheme == 'light':
                 color_scheme = Adw.ColorScheme.FORCE_LIGHT
             else:
                 color_scheme = Adw.ColorScheme.DEFAULT
 
-            Adw.StyleManager.get_default().set_color_scheme(color_scheme)
+            self._style_manager.set_color_scheme(color_scheme)
 
-        if not self._night_light_proxy:
+        def on_proxy_ready(_source, result):
+            try:
+                self._night_light_proxy = Gio.DBusProxy.new_for_bus_finish(result)
+            except GLib.GError as error:
+                self.application.logger.warning(f'Failed to watch night light changes: {error.message}')
+                return
+
+            self._night_light_handler_id = self._night_light_proxy.connect('g-properties-changed', property_changed)
+
+            set_color_scheme()
+
+        def property_changed(_proxy, changed_properties, _invalidated_properties):
+            properties = changed_properties.unpack()
+            if 'NightLightActive' in properties:
+                set_color_scheme()
+
+        if not self._night_light_proxy and not self._night_light_proxy_requested:
             # Watch night light changes
-            self._night_light_proxy = Gio.DBusProxy.new_sync(
-                Gio.bus_get_sync(Gio.BusType.SESSION, None),
+            # Proxy is created asynchronously to not block main loop while waiting for D-Bus
+            self._night_light_proxy_requested = True
+            Gio.DBusProxy.new_for_bus(
+                Gio.BusType.SESSION,
                 Gio.DBusProxyFlags.NONE,
                 None,
                 'org.gnome.SettingsDaemon.Color',
                 '/org/gnome/SettingsDaemon/Color',
                 'org.gnome.SettingsDaemon.Color',
-                None
+                None,
+                on_proxy_ready
             )
 
-            def property_changed(_proxy, changed_properties, _invalidated_properties):
-                properties = changed_properties.unpack()
-                if 'NightLightActive' in properties:
-                    set_color_scheme()
+        set_color_scheme()
 
-            self._night_light_handler_id = self._night_light_proxy.connect('g-properties-changed', property_changed)
+    def init_webview(self):
+        from komikku.webview import WebviewPage
 
-        set_color_scheme()
+        self._webview = WebviewPage(self)
 
     def install_servers_modules(self):
         def run():
@@ -394,39 +581,46 @@ class ApplicationWindow(Adw.ApplicationWindow):
             else:
                 self.application.logger.info('Failed to update servers modules')
 
-        thread = threading.Thread(target=run)
-        thread.daemon = True
-        thread.start()
-
-    def on_about_menu_clicked(self, _action, _param):
-        dialog = Adw.AboutDialog.new_from_appdata('/info/febvre/Komikku/metainfo.xml', self.application.version)
+        # Don't submit a new job while previous one is pending (network status can flap)
+        if self.install_servers_modules_future is not None and not self.install_servers_modules_future.done():
+            return
 
-        dialog.set_copyright(f'© 2019-{datetime.date.today().year} {self.application.author} et al.')
-        dialog.set_comments(_("""A manga, webtoons and comics reader
+        self.install_servers_modules_future = self.application.executor.submit(run)
 
-👉 Never forget, you can support the authors
-by buying the official comics when they are
-available in your region/language."""))
-        dialog.set_artists(CREDITS['artists'])
-        dialog.set_designers(CREDITS['designers'])
-        dialog.set_developers(CREDITS['developers'])
-        dialog.set_translator_credits('\n'.join(CREDITS['translators']))
-        dialog.add_acknowledgement_section(_('Supporters'), CREDITS['supporters'])
-        dialog.set_support_url('https://matrix.to/#/#komikku-gnome:matrix.org')
-        dialog.add_link(_('Join Chat'), 'https://matrix.to/#/#komikku-gnome:matrix.org')
+    def on_about_menu_clicked(self, _action, _param):
+        from komikku.debug_info import DebugInfo
 
-        # Override release notes
-        dialog.set_release_notes(RELEASE_NOTES)
+        def run(debug_info):
+            GLib.idle_add(self.about_dialog.set_debug_info, debug_info.generate())
 
-        debug_info = DebugInfo(self.application)
-        dialog.set_debug_info_filename('Komikku-debug-info.txt')
-        dialog.set_debug_info(debug_info.generate())
+        self.about_dialog.present(self)
 
-        dialog.present(self)
+        # Debug info is the only part of dialog which may change between two openings
+        # Generation is costly (command-line tools are probed), it's done in background once dialog has been presented
+        # DebugInfo must be instantiated in main thread (GTK info is collected at init)
+        self.application.executor.submit(run, DebugInfo(self.application))
 
     def on_banner_button_clicked(self, _banner):
         self.banner.props.revealed = False
 
+    def on_db_ready(self, *args):
+        self.library.populate()
+
+        def emit_network_changed():
+            # Non-portal implementations of Gio.NetworkMonitor (app not running under Flatpak) don't actually change the value
+            # unless the network state actually changes
+            Gio.NetworkMonitor.get_default().emit('network-changed', None)
+
+            return GLib.SOURCE_REMOVE
+
+        Gio.NetworkMonitor.get_default().connect('network-changed', self.on_network_status_changed)
+        # Let library be painted first
+        GLib.idle_add(emit_network_changed, priority=GLib.PRIORITY_LOW)
+
+    def on_monitor_changed(self, *args):
+        self._monitor = None
+        self._monitor_width = None
+
     def on_navigation_popped(self, _nav, _page):
         self.last_navigation_action = 'pop'
 
@@ -438,64 +632,83 @@ available in your region/language."""))
 
         self.banner.props.revealed = False
 
+    def on_navigation_visible_page_changed(self, navigationview, _gparam):
+        # Keep current and previous pages tags up to date, they are read by many handlers (key presses, actions,...)
+        visible_page = navigationview.get_visible_page()
+        previous_page = navigationview.get_previous_page(visible_page) if visible_page else None
+
+        self._page_tag = visible_page.props.tag if visible_page else None
+        self._previous_page_tag = previous_page.props.tag if previous_page else None
+
     def on_network_status_changed(self, monitor, _connected):
+        def update_library_at_startup():
+            self.updater.update_library(startup=True)
+
+            return GLib.SOURCE_REMOVE
+
         connectivity = monitor.get_connectivity()
-        if _connected != self.network_available:
-            self.application.logger.warning('Connection status: {}'.format(connectivity))
-        self.network_available = connectivity == Gio.NetworkConnectivity.FULL
+        network_available = connectivity == Gio.NetworkConnectivity.FULL
+        if network_available == self.network_available:
+            # Not a real transition (synthetic emission at startup, connectivity change without impact on availability,...)
+            # Nothing to start or stop
+            return
+
+        self.application.logger.warning('Connection status: {}'.format(connectivity))
+        self.network_available = network_available
+
+        settings = self._settings
 
         if self.network_available:
             # Install external servers modules
-            if Settings.get_default().external_servers_modules and not self.external_servers_modules_update_at_startup_done:
+            if settings.external_servers_modules and not self.external_servers_modules_update_at_startup_done:
                 self.external_servers_modules_update_at_startup_done = True
                 self.install_servers_modules()
 
             # Automatically update library at startup
-            if Settings.get_default().update_at_startup and not self.updater.update_at_startup_done:
-                self.updater.update_library(startup=True)
+            if settings.update_at_startup and not self.updater.update_at_startup_done:
+                # Flag is set right away to not schedule update twice, mangas loading is done once main loop is idle
+                self.updater.update_at_startup_done = True
+                GLib.idle_add(update_library_at_startup, priority=GLib.PRIORITY_LOW)
 
             # Start Downloader
-            if Settings.get_default().downloader_state:
+            if settings.downloader_state:
                 self.downloader.start()
 
             # Sync trackers: offline read progress
             self.trackers.sync()
+            # Prefetch missing trackers logos, so they are ready when tracking dialog is opened
+            self.trackers.fetch_logos()
         else:
             # Stop Updater
             self.updater.stop()
 
             # Stop Downloader
-            if Settings.get_default().downloader_state:
+            if settings.downloader_state:
                 self.downloader.stop()
 
+    def on_notification_child_revealed_changed(self, revealer, _gparam):
+        if not revealer.get_child_revealed():
+            self.schedule_notification()
+
     def on_preferences_menu_clicked(self, _action, _param):
         self.preferences.show()
 
-    def on_resize(self, _window, allocation):
-        def on_maximized():
-            # Gtk.Window::maximized (idem with Gdk.Toplevel:state) event is unreliable because it's emitted too earlier
-            # We detect that maximization is effective by comparing monitor size and window size
-            scale_factor = self.get_native().get_surface().get_scale()
-            monitor_width = self.monitor.props.geometry.width / scale_factor
-            if self.get_width() < monitor_width and self.is_maximized():
-                return True
-
-            do_resize()
-
-        def do_resize():
-            self.library.on_resize()
+    def on_realize(self, _window):
+        surface = self.get_surface()
+        surface.connect('enter-monitor', self.on_monitor_changed)
+        surface.connect('notify::scale', self.on_monitor_changed)
 
+    def on_resize(self, _window, allocation):
+        # Size related notifications come in bursts (default-width and default-height are notified together,
+        # at every frame of an interactive resize): they are all handled by a single pending source
         if allocation.name == 'maximized':
-            GLib.idle_add(on_maximized)
-        else:
-            do_resize()
+            self.resize_maximized_pending = True
 
-    def on_shortcuts_menu_clicked(self, _action, _param):
-        builder = Gtk.Builder()
-        builder.add_from_resource('/info/febvre/Komikku/ui/shortcuts.ui')
+        if self.resize_timeout_id is None:
+            self.resize_timeout_id = GLib.timeout_add(50, self.flush_resize)
 
-        dialog = builder.get_object('shortcuts_dialog')
-        dialog.present(self)
+    def on_shortcuts_menu_clicked(self, _action, _param):
+        self.shortcuts_dialog.present(self)
 
     def open_dialog(self, heading, body=None, child=None, confirm_label=None, confirm_callback=None, confirm_appearance=None, cancel_label=None, cancel_callback=None):
         def on_response(dialog, response_id):
@@ -526,6 +739,17 @@ available in your region/language."""))
     def open_support(self, _action, _param):
         self.support.show()
 
+    def peek_page(self, name):
+        """
+        Returns page (or dialog) `name` if it has already been instantiated, None otherwise
+
+        Unlike attribute access, page is never instantiated.
+        """
+        if name == 'webview':
+            return self._webview
+
+        return self.__dict__.get(name)
+
     def quit(self, *args, force=False):
         def confirm_callback():
             self.downloader.stop()
@@ -537,8 +761,15 @@ available in your region/language."""))
             if self.downloader.running or self.updater.running:
                 return GLib.SOURCE_CONTINUE
 
+            if self.notification_timer:
+                GLib.Source.remove(self.notification_timer)
+                self.notification_timer = None
+
+            # Drop background jobs not yet started
+            self.application.executor.shutdown(wait=False, cancel_futures=True)
+
             self.save_window_size()
-            if Settings.get_default().clear_cached_data_on_app_close:
+            if self._settings.clear_cached_data_on_app_close:
                 clear_cached_data()
 
             backup_db()
@@ -583,19 +814,25 @@ available in your region/language."""))
         if self.is_fullscreen():
             return
 
-        Settings.get_default().window_maximized_state = self.is_maximized()
+        settings = self._settings
+        maximized = self.is_maximized()
+
+        # Only write changed keys, in a single transaction
+        settings.delay()
+
+        if settings.window_maximized_state != maximized:
+            settings.window_maximized_state = maximized
 
-        if not self.is_maximized():
+        if not maximized:
             size = self.get_default_size()
-            Settings.get_default().window_size = [size.width, size.height]
+            if settings.window_size != (size.width, size.height):
+                settings.window_size = [size.width, size.height]
+
+        settings.apply()
 
     def select_all(self, _action, _param):
-        if self.page == 'library':
-            self.library.select_all()
-        elif self.page == 'card':
-            self.card.chapters_list.select_all()
-        elif self.page == 'download-manager':
-            self.download_manager.select_all()
+        if select_all := self.select_all_handlers.get(self.page):
+            select_all()
 
     def show_banner(self, title, at_bottom=False):
         self.banner.props.title = title
@@ -606,12 +843,20 @@ available in your region/language."""))
             self.banner.props.valign = Gtk.Align.END
         self.banner.props.revealed = True
 
+    def schedule_notification(self):
+        # A single idle source is pending at most, whatever the number of queued notifications
+        if self.notification_source_id is None:
+            self.notification_source_id = GLib.idle_add(self.show_notification)
+
     def show_notification(self):
+        self.notification_source_id = None
+
         if len(self.notification_queue) == 0:
             return GLib.SOURCE_REMOVE
 
         if self.notification_revealer.get_child_revealed() or self.notification_active:
-            return GLib.SOURCE_CONTINUE
+            # Rescheduled when current notification is hidden
+            return GLib.SOURCE_REMOVE
 
         self.notification_active = True
 
@@ -624,8 +869,9 @@ available in your region/language."""))
         self.notification_label.set_text(notification['message'])
         self.notification_revealer.set_reveal_child(True)
 
-        self.notification_timer = threading.Timer(notification['timeout'], GLib.idle_add, args=[self.hide_notification])
-        self.notification_timer.start()
+        if self.notification_timer:
+            GLib.Source.remove(self.notification_timer)
+        self.notification_timer = GLib.timeout_add_seconds(notification['timeout'], self.hide_notification)
 
         return GLib.SOURCE_REMOVE
 
@@ -2,7 +2,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Author: Valéry Febvre <vfebvre@easter-eggs.com>
 
+from collections import OrderedDict
+from functools import cached_property
 from gettext import gettext as _
+import os
 
 from gi.repository import Adw
 from gi.repository import Gdk
@@ -15,13 +18,14 @@ from komikku.consts import COVER_WIDTH
 from komikku.consts import MISSING_IMG_RESOURCE_PATH
 from komikku.card.categories_list import CategoriesList
 from komikku.card.chapters_list import ChaptersList
-from komikku.card.tracking import TrackingDialog
 from komikku.models import Category
 from komikku.models import Settings
 from komikku.utils import CoverPicture
 from komikku.utils import folder_size
 from komikku.utils import html_escape
 
+BACKDROP_OPACITIES_CACHE_SIZE = 100
+
 
 @Gtk.Template.from_resource('/info/febvre/Komikku/ui/card.ui')
 class CardPage(Adw.NavigationPage):
@@ -35,7 +39,7 @@ class CardPage(Adw.NavigationPage):
     viewswitcher = Gtk.Template.Child('viewswitcher')
     menu_button = Gtk.Template.Child('menu_button')
 
-    activity_progressbar = Gtk.Template.Child('activity_progressbar')
+    activity_spinner = Gtk.Template.Child('activity_spinner')
     stack = Gtk.Template.Child('stack')
     categories_stack = Gtk.Template.Child('categories_stack')
     categories_scrolledwindow = Gtk.Template.Child('categories_scrolledwindow')
@@ -66,30 +70,42 @@ class CardPage(Adw.NavigationPage):
     size_on_disk_label = Gtk.Template.Child('size_on_disk_label')
     viewswitcherbar = Gtk.Template.Child('viewswitcherbar')
 
+    backdrop_opacities = OrderedDict()  # LRU
+    drag_vadjustment = None
+    filters_page_key = None
     manga = None
+    manga_updated_changes = None
+    manga_updated_source_id = None
+    manga_updated_synced = False
+    menu_model = None
     pool_to_update = False
     pool_to_update_offset = 0
     selection_mode = False
+    visible_page_name = None
 
     def __init__(self, window):
         Adw.NavigationPage.__init__(self)
 
         self.window = window
         self.builder = window.builder
-        self.builder.add_from_resource('/info/febvre/Komikku/ui/menu/card.xml')
-        self.builder.add_from_resource('/info/febvre/Komikku/ui/menu/card_selection_mode.xml')
 
         self.css_provider = Gtk.CssProvider.new()
         Gtk.StyleContext.add_provider_for_display(Gdk.Display.get_default(), self.css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
 
         self.connect('shown', self.on_shown)
         self.stack.connect('notify::visible-child-name', self.on_page_changed)
+        self.categories_stack_page = self.stack.get_page(self.stack.get_child_by_name('categories'))
+        self.chapters_stack_page = self.stack.get_page(self.stack.get_child_by_name('chapters'))
         self.window.controller_key.connect('key-pressed', self.on_key_pressed)
+        Adw.StyleManager.get_default().connect('notify::dark', self.on_dark_changed)
 
         # Header bar
         self.left_button.connect('clicked', self.leave_selection_mode)
         self.filters_button.connect('clicked', self.on_filters_button_clicked)
-        self.menu_button.set_menu_model(self.builder.get_object('menu-card'))
+        if CardPage.menu_model is None:
+            # Menu model is shared by all instances, resource is parsed once
+            CardPage.menu_model = Gtk.Builder.new_from_resource('/info/febvre/Komikku/ui/menu/card.xml').get_object('menu-card')
+        self.menu_button.set_menu_model(self.menu_model)
         # Focus is lost after showing popover submenu (bug?)
         self.menu_button.get_popover().connect('closed', lambda _popover: self.menu_button.grab_focus())
 
@@ -100,11 +116,16 @@ class CardPage(Adw.NavigationPage):
         self.gesture_drag = Gtk.GestureDrag.new()
         self.gesture_drag.set_touch_only(True)
         self.gesture_drag.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        self.gesture_drag.connect('drag-begin', self.on_gesture_drag_begin)
         self.gesture_drag.connect('drag-end', self.on_gesture_drag_end)
         self.gesture_drag.connect('drag-update', self.on_gesture_drag_update)
         self.stack.add_controller(self.gesture_drag)
-
-        self.tracking_dialog = TrackingDialog(self.window)
+        # Vertical adjustments of pages, read on every drag update
+        self.vadjustments = {
+            'categories': self.categories_scrolledwindow.get_vadjustment(),
+            'chapters': self.chapters_scrolledwindow.get_vadjustment(),
+            'info': self.info_scrolledwindow.get_vadjustment(),
+        }
 
         self.info_box = InfoBox(self)
         self.categories_list = CategoriesList(self)
@@ -114,6 +135,8 @@ class CardPage(Adw.NavigationPage):
         self.filters_dialog.set_title(_('Filters'))
         self.filters_dialog.props.presentation_mode = Adw.DialogPresentationMode.BOTTOM_SHEET
 
+        self.window.updater.connect('manga-update-ended', self.on_manga_update_ended)
+        self.window.updater.connect('manga-update-started', self.on_manga_update_started)
         self.window.updater.connect('manga-updated', self.on_manga_updated)
         self.window.trackers.connect('manga-tracker-synced', self.on_manga_tracker_synced)
 
@@ -122,6 +145,12 @@ class CardPage(Adw.NavigationPage):
 
         self.window.navigationview.add(self)
 
+    @cached_property
+    def tracking_dialog(self):
+        from komikku.card.tracking import TrackingDialog
+
+        return TrackingDialog(self.window)
+
     def add_actions(self):
         self.resume_action = Gio.SimpleAction.new('card.resume', None)
         self.resume_action.connect('activate', self.on_resume_button_clicked)
@@ -174,9 +203,17 @@ class CardPage(Adw.NavigationPage):
         self.stack.set_visible_child_name('info')
 
         # Hide Categories if manga is not in Library
-        self.stack.get_page(self.stack.get_child_by_name('categories')).set_visible(manga.in_library)
+        self.categories_stack_page.set_visible(manga.in_library)
+
+        # Drop a pending coalesced update of previous manga
+        if self.manga_updated_source_id is not None:
+            GLib.source_remove(self.manga_updated_source_id)
+            self.manga_updated_source_id = None
+            self.manga_updated_changes = None
+            self.manga_updated_synced = False
 
         self.manga = manga
+        self.info_box.fingerprint = None
         # Unref chapters to force a reload
         self.manga._chapters = None
 
@@ -202,7 +239,7 @@ class CardPage(Adw.NavigationPage):
 
     def on_add_button_clicked(self, _button):
         # Show categories
-        self.stack.get_page(self.stack.get_child_by_name('categories')).set_visible(True)
+        self.categories_stack_page.set_visible(True)
         # Hide Add to Library button
         self.info_box.add_button.set_visible(False)
         self.info_box.resume_button.add_css_class('suggested-action')
@@ -213,28 +250,42 @@ class CardPage(Adw.NavigationPage):
     def on_delete_menu_clicked(self, _action, _gparam):
         self.window.library.delete_mangas([self.manga, ])
 
-    def on_filters_button_clicked(self, _button):
+    def on_dark_changed(self, _style_manager, _gparam):
+        if self.manga is None or self.backdrop_picture.get_paintable() is None:
+            return
+
+        self.set_backdrop_opacity()
+
+    def on_filter_scanlator_active(self, row, _param, scanlator):
         filters = self.manga.filters or {}
+        excluded_scanlators = set(filters.get('scanlators', ()))
 
-        def on_active(row, _param, scanlator):
-            if 'scanlators' not in filters:
-                filters['scanlators'] = []
+        if row.get_active():
+            excluded_scanlators.discard(scanlator)
+        else:
+            excluded_scanlators.add(scanlator)
 
-            if row.get_active():
-                filters['scanlators'].remove(scanlator)
-            else:
-                filters['scanlators'].append(scanlator)
+        if excluded_scanlators:
+            self.filters_button.add_css_class('accent')
+        else:
+            self.filters_button.remove_css_class('accent')
 
-            if filters['scanlators']:
-                self.filters_button.add_css_class('accent')
-            else:
-                self.filters_button.remove_css_class('accent')
+        filters['scanlators'] = sorted(excluded_scanlators)
+        self.manga.update({
+            'filters': filters,
+        })
+
+        self.chapters_list.excluded_scanlators = frozenset(excluded_scanlators)
+        self.chapters_list.list_model.invalidate_filter()
 
-            self.manga.update({
-                'filters': filters,
-            })
+    def on_filters_button_clicked(self, _button):
+        # Page is rebuilt only if manga or its scanlators have changed
+        key = (self.manga.id, tuple((scanlator['name'], scanlator['count']) for scanlator in self.manga.chapters_scanlators))
+        if key == self.filters_page_key:
+            self.filters_dialog.present(self.window)
+            return
 
-            self.chapters_list.list_model.invalidate_filter()
+        filters = self.manga.filters or {}
 
         # Remove a previous used page if exists
         if page := self.filters_dialog.get_visible_page():
@@ -254,7 +305,7 @@ class CardPage(Adw.NavigationPage):
             row = Adw.SwitchRow(title=title)
             row.set_use_markup(True)
             row.set_active(not filters or 'scanlators' not in filters or scanlator['name'] not in filters['scanlators'])
-            row.connect('notify::active', on_active, scanlator['name'])
+            row.connect('notify::active', self.on_filter_scanlator_active, scanlator['name'])
 
             label = Gtk.Label(label=scanlator['count'], valign=Gtk.Align.CENTER)
             label.set_css_classes(['badge', 'caption'])
@@ -263,9 +314,17 @@ class CardPage(Adw.NavigationPage):
             group.add(row)
 
         page.add(group)
+        self.filters_page_key = key
 
         self.filters_dialog.present(self.window)
 
+    def on_gesture_drag_begin(self, _controller, start_x, start_y):
+        # Resolve once per drag what drag updates need
+        if self.selection_mode or start_x < 32 or start_y > self.get_height() / 3:
+            self.drag_vadjustment = None
+        else:
+            self.drag_vadjustment = self.vadjustments[self.stack.get_visible_child_name()]
+
     def on_gesture_drag_end(self, _controller, _offset_x, _offset_y):
         self.stack.set_opacity(1)
         self.stack.remove_css_class('grayscale')
@@ -284,26 +343,15 @@ class CardPage(Adw.NavigationPage):
         self.gesture_drag.set_state(Gtk.EventSequenceState.CLAIMED)
 
     def on_gesture_drag_update(self, _controller, _offset_x, offset_y):
-        _active, start_x, start_y = self.gesture_drag.get_start_point()
-
-        page = self.stack.get_visible_child_name()
-        if page == 'info':
-            scroll_value = self.info_scrolledwindow.get_vadjustment().props.value
-        elif page == 'chapters':
-            scroll_value = self.chapters_scrolledwindow.get_vadjustment().props.value
-        else:
-            scroll_value = self.categories_scrolledwindow.get_vadjustment().props.value
-
-        if scroll_value != 0 or offset_y < 0 or self.selection_mode or start_x < 32 or start_y > self.get_height() / 3:
+        if self.drag_vadjustment is None or self.drag_vadjustment.get_value() != 0 or offset_y < 0:
             return
 
-        self.stack.set_opacity(0.5)
-        self.stack.add_css_class('grayscale')
-
         self.pool_to_update_offset = offset_y
 
         if not self.pool_to_update:
             self.pool_to_update = True
+            self.stack.set_opacity(0.5)
+            self.stack.add_css_class('grayscale')
             # Adjust revealer position
             self.pool_to_update_revealer.set_margin_top(self.toolbar_view.get_top_bar_height())
             self.pool_to_update_revealer.props.transition_type = Gtk.RevealerTransitionType.NONE
@@ -339,19 +387,48 @@ class CardPage(Adw.NavigationPage):
         if (self.window.page == self.props.tag or self.window.previous_page == self.props.tag) and self.manga.id == manga.id:
             self.manga = manga
 
+    def on_manga_update_ended(self, _updater, manga_id):
+        if self.manga and self.manga.id == manga_id:
+            self.activity_spinner.set_visible(False)
+
+    def on_manga_update_started(self, _updater, manga_id):
+        if self.manga and self.manga.id == manga_id:
+            self.activity_spinner.set_visible(True)
+
     def on_manga_updated(self, _updater, manga, chapters_changes, synced):
+        def flush():
+            self.manga_updated_source_id = None
+
+            if self.manga.id == manga_id:
+                self.info_box.populate()
+                self.toggle_filters_button()
+
+                if sum(self.manga_updated_changes.values()) > 0:
+                    self.chapters_list.populate()
+                    self.refresh(unread_chapters=True)
+
+                if self.manga_updated_synced:
+                    self.window.add_notification(_('Read progress synchronization with server completed successfully'))
+
+            self.manga_updated_changes = None
+            self.manga_updated_synced = False
+
+            return GLib.SOURCE_REMOVE
+
         if (self.window.page == self.props.tag or self.window.previous_page == self.props.tag) and self.manga.id == manga.id:
             self.manga = manga
+            manga_id = manga.id
 
-            self.info_box.populate()
-            self.toggle_filters_button()
-
-            if sum(chapters_changes.values()) > 0:
-                self.chapters_list.populate()
-                self.refresh(unread_chapters=True)
+            # Coalesce bursts of updates: repopulate once per burst
+            if self.manga_updated_changes is None:
+                self.manga_updated_changes = dict(chapters_changes)
+            else:
+                for key, value in chapters_changes.items():
+                    self.manga_updated_changes[key] = self.manga_updated_changes.get(key, 0) + value
+            self.manga_updated_synced = self.manga_updated_synced or synced
 
-            if synced:
-                self.window.add_notification(_('Read progress synchronization with server completed successfully'))
+            if self.manga_updated_source_id is None:
+                self.manga_updated_source_id = GLib.timeout_add(150, flush)
 
     def on_open_in_browser_menu_clicked(self, _action, _gparam):
         if uri := self.manga.server.get_manga_url(self.manga.slug, self.manga.url):
@@ -360,6 +437,12 @@ class CardPage(Adw.NavigationPage):
             self.window.add_notification(_('Failed to get manga URL'))
 
     def on_page_changed(self, _page, _gparam):
+        # Notification can be emitted without an actual page change
+        name = self.stack.get_visible_child_name()
+        if name == self.visible_page_name:
+            return
+
+        self.visible_page_name = name
         self.toggle_filters_button()
 
     def on_resume_button_clicked(self, *args):
@@ -394,12 +477,9 @@ class CardPage(Adw.NavigationPage):
             # Operation is resource intensive and could disrupt page transition
             self.populate()
 
-        if not Gtk.Settings.get_default().get_property('gtk-enable-animations'):
-            # When animations are disabled, popped/pushed events are sent after `shown` event (bug?)
-            # Use idle_add to be sure that last `popped` or `pushed` event has been received
-            GLib.idle_add(do_populate)
-        else:
-            do_populate()
+        # When animations are disabled, popped/pushed events are sent after `shown` event (bug?)
+        # Always use idle_add to be sure that last `popped` or `pushed` event has been received
+        GLib.idle_add(do_populate, priority=GLib.PRIORITY_LOW)
 
     def on_update_request(self, _action=None, _param=None):
         self.window.updater.add(self.manga)
@@ -443,13 +523,7 @@ class CardPage(Adw.NavigationPage):
         if method == 'blurred-cover':
             if path := self.manga.backdrop_image_fs_path:
                 self.backdrop_picture.set_filename(path)
-
-                if info := self.manga.backdrop_info:
-                    if Adw.StyleManager.get_default().get_dark():
-                        opacity = 1 - info['luminance'][0]
-                    else:
-                        opacity = info['luminance'][1]
-                    self.backdrop_picture.set_opacity(opacity)
+                self.set_backdrop_opacity()
 
         elif method == 'linear-gradient':
             if css := self.manga.backdrop_colors_css:
@@ -457,12 +531,27 @@ class CardPage(Adw.NavigationPage):
 
         self.add_css_class('backdrop')
 
+    def set_backdrop_opacity(self):
+        # Backdrop is computed from cover: key includes cover path and mtime, cover may change while card is not shown
+        key = (self.manga.id, self.info_box.cover_key)
+        if key in self.backdrop_opacities:
+            self.backdrop_opacities.move_to_end(key)
+        else:
+            if info := self.manga.backdrop_info:
+                # Opacities for light and dark color schemes
+                self.backdrop_opacities[key] = (info['luminance'][1], 1 - info['luminance'][0])
+            else:
+                self.backdrop_opacities[key] = None
+
+            if len(self.backdrop_opacities) > BACKDROP_OPACITIES_CACHE_SIZE:
+                self.backdrop_opacities.popitem(last=False)
+
+        if opacities := self.backdrop_opacities[key]:
+            self.backdrop_picture.set_opacity(opacities[Adw.StyleManager.get_default().get_dark()])
+
     def set_unread_chapters_badge(self):
         # Show unread chapters (with Adw.ViewStackPage badge) if any
-        if unread_chapters := self.manga.nb_unread_chapters:
-            self.stack.get_page(self.stack.get_child_by_name('chapters')).set_badge_number(unread_chapters)
-        else:
-            self.stack.get_page(self.stack.get_child_by_name('chapters')).set_badge_number(0)
+        self.chapters_stack_page.set_badge_number(self.manga.nb_unread_chapters or 0)
 
     def show(self):
         self.props.title = self.manga.name  # Adw.NavigationPage title
@@ -479,28 +568,14 @@ class CardPage(Adw.NavigationPage):
         self.open_in_browser_action.set_enabled(not self.manga.is_local)
 
         # Reset scrolling in all pages
-        for page in self.stack.get_pages():
-            scrolledwindow = page.get_child() if page.props.name != 'chapters' else page.get_child().get_first_child()
-            scrolledwindow.get_vadjustment().configure(0, 0, 0, 0, 0, 0)
+        for vadjustment in self.vadjustments.values():
+            vadjustment.set_value(0)
 
         self.window.navigationview.push(self)
 
     def show_activity_indicator(self):
-        def pulse(manga_id):
-            if self.window.page != self.props.tag:
-                # Page left, stop indicator
-                self.activity_progressbar.props.fraction = 0
-                return GLib.SOURCE_REMOVE
-
-            if self.window.updater.current_id == manga_id:
-                self.activity_progressbar.pulse()
-                return GLib.SOURCE_CONTINUE
-
-            # Update is ended, stop indicator
-            self.activity_progressbar.props.fraction = 0
-            return GLib.SOURCE_REMOVE
-
-        GLib.timeout_add(250, pulse, self.manga.id)
+        # Visible while manga is updated, then driven by updater signals
+        self.activity_spinner.set_visible(self.window.updater.current_id == self.manga.id)
 
     def toggle_filters_button(self):
         name = self.stack.get_visible_child_name()
@@ -529,6 +604,7 @@ class InfoBox:
         self.title_box = self.card.title_box
         self.cover_box = self.card.cover_box
         self.cover_picture = None
+        self.cover_key = None
         self.name_label = self.card.name_label
         self.authors_label = self.card.authors_label
         self.status_server_label = self.card.status_server_label
@@ -536,13 +612,20 @@ class InfoBox:
         self.add_button = self.card.add_button
         self.resume_button = self.card.resume_button
         self.genres_wrapbox = self.card.genres_wrapbox
+        self.genres_labels = []
         self.categories_wrapbox = self.card.categories_wrapbox
+        self.categories_labels = []
         self.scanlators_label = self.card.scanlators_label
         self.chapters_label = self.card.chapters_label
         self.last_update_label = self.card.last_update_label
         self.synopsis_label = self.card.synopsis_label
         self.size_on_disk_label = self.card.size_on_disk_label
 
+        # Disk usage per manga path: (latest mtime of manga and chapters folders, size)
+        self.disk_usage_cache = {}
+        # Hash of manga displayed data, used to skip no-op populates
+        self.fingerprint = None
+
         self.add_button.connect('clicked', self.card.on_add_button_clicked)
         self.resume_button.connect('clicked', self.card.on_resume_button_clicked)
 
@@ -558,31 +641,39 @@ class InfoBox:
         self.window.breakpoint.add_setter(self.buttons_box, 'spacing', 18)
         self.window.breakpoint.add_setter(self.buttons_box, 'halign', Gtk.Align.CENTER)
 
-    def populate(self):
+    def get_fingerprint(self):
         manga = self.card.manga
 
-        # Name
-        self.name_label.set_text(manga.name)
+        # Only cheap fields: chapters changes always bump last_update, cover key is computed by set_cover()
+        return hash((
+            manga.id,
+            manga.name,
+            manga.status,
+            manga.in_library,
+            tuple(manga.authors or ()),
+            tuple(manga.genres or ()),
+            tuple(sorted(manga.categories or ())),
+            tuple(manga.scanlators or ()),
+            manga.last_update,
+            manga.synopsis,
+            self.cover_key,
+        ))
+
+    def populate(self):
+        manga = self.card.manga
 
         # Cover
-        if self.cover_picture:
-            self.cover_box.remove(self.cover_picture)
+        # Checked before fingerprint: picture may have been released while data is unchanged
+        self.set_cover()
 
-        if manga.cover_fs_path is None:
-            self.cover_picture = CoverPicture.new_from_resource(MISSING_IMG_RESOURCE_PATH, width=COVER_WIDTH)
-            self.card.remove_backdrop()
-        else:
-            picture = CoverPicture.new_from_file(manga.cover_fs_path, width=COVER_WIDTH)
-            if picture:
-                self.cover_picture = picture
-                self.card.set_backdrop()
-            else:
-                self.cover_picture = CoverPicture.new_from_resource(MISSING_IMG_RESOURCE_PATH, width=COVER_WIDTH)
-                self.card.remove_backdrop()
+        # Skip if nothing displayed has changed since last populate
+        fingerprint = self.get_fingerprint()
+        if fingerprint == self.fingerprint:
+            return
+        self.fingerprint = fingerprint
 
-        self.cover_picture.props.can_shrink = False
-        self.cover_picture.add_css_class('cover-dropshadow')
-        self.cover_box.append(self.cover_picture)
+        # Name
+        self.name_label.set_text(manga.name)
 
         # Authors
         authors = html_escape(', '.join(manga.authors)) if manga.authors else _('Unknown author')
@@ -590,21 +681,13 @@ class InfoBox:
 
         # Server (link to server page)
         if not manga.is_local:
-            self.status_server_label.set_markup(
-                '{0} · <a href="{1}">{2}</a> ({3})'.format(
-                    _(manga.STATUSES[manga.status]) if manga.status else _('Unknown status'),
-                    manga.server.get_manga_url(manga.slug, manga.url),
-                    html_escape(manga.server.name),
-                    manga.server.lang.upper() if manga.server.lang else '??'
-                )
-            )
+            # Statuses labels are already translated
+            status = manga.STATUSES[manga.status] if manga.status else _('Unknown status')
+            url = manga.server.get_manga_url(manga.slug, manga.url)
+            lang = manga.server.lang.upper() if manga.server.lang else '??'
+            self.status_server_label.set_markup(f'{status} · <a href="{url}">{html_escape(manga.server.name)}</a> ({lang})')
         else:
-            self.status_server_label.set_markup(
-                '{0} · {1}'.format(
-                    _('Unknown status'),
-                    html_escape(_('Local'))
-                )
-            )
+            self.status_server_label.set_markup(f'{_("Unknown status")} · {html_escape(_("Local"))}')
 
         # Resume button
         if manga.in_library:
@@ -616,15 +699,7 @@ class InfoBox:
 
         # Genres
         if manga.genres:
-            self.genres_wrapbox.remove_all()
-
-            for genre in sorted(manga.genres):
-                label = Gtk.Label()
-                label.set_ellipsize(Pango.EllipsizeMode.END)
-                label.set_markup(html_escape(genre))
-                label.set_css_classes(['genre-label', 'caption'])
-                self.genres_wrapbox.append(label)
-
+            self.set_wrapbox_labels(self.genres_wrapbox, self.genres_labels, sorted(manga.genres), 'genre-label')
             self.genres_wrapbox.get_parent().set_visible(True)
         else:
             self.genres_wrapbox.get_parent().set_visible(False)
@@ -662,23 +737,91 @@ class InfoBox:
             self.synopsis_label.set_markup(synopsis)  # can failed with a warning: parsing markup error
 
     def refresh(self):
-        self.set_disk_usage()
+        self.set_disk_usage(invalidate=True)
 
     def set_categories(self):
-        if self.card.manga.categories:
-            self.categories_wrapbox.remove_all()
-
-            for category_id in sorted(self.card.manga.categories):
-                category = Category.get(category_id)
-                label = Gtk.Label()
-                label.set_ellipsize(Pango.EllipsizeMode.END)
-                label.set_markup(html_escape(category.label))
-                label.set_css_classes(['category-label', 'caption'])
-                self.categories_wrapbox.append(label)
+        if categories := self.card.manga.categories:
+            texts = [Category.get(category_id).label for category_id in sorted(categories)]
+            self.set_wrapbox_labels(self.categories_wrapbox, self.categories_labels, texts, 'category-label')
 
             self.categories_wrapbox.get_parent().set_visible(True)
         else:
             self.categories_wrapbox.get_parent().set_visible(False)
 
-    def set_disk_usage(self):
-        self.size_on_disk_label.set_text(folder_size(self.card.manga.path) or '-')
+    def set_cover(self):
+        path = self.card.manga.cover_fs_path
+        cover_key = (path, os.stat(path).st_mtime if path else None)
+
+        # Picture (and backdrop) are only rebuilt if cover file has changed
+        # or if picture has been disposed (paintable is released when picture is unrealized)
+        if self.cover_picture is not None and cover_key == self.cover_key:
+            paintable = self.cover_picture.get_paintable()
+            if paintable.pixbuf is not None or paintable.texture is not None:
+                return
+
+        self.cover_key = cover_key
+
+        # New picture is fully built before the old one is swapped out, so widget tree is only touched once
+        picture = CoverPicture.new_from_file(path, width=COVER_WIDTH) if path else None
+        if picture:
+            self.card.set_backdrop()
+        else:
+            picture = CoverPicture.new_from_resource(MISSING_IMG_RESOURCE_PATH, width=COVER_WIDTH)
+            self.card.remove_backdrop()
+
+        picture.props.can_shrink = False
+        picture.add_css_class('cover-dropshadow')
+
+        if self.cover_picture:
+            self.cover_box.remove(self.cover_picture)
+        self.cover_picture = picture
+        self.cover_box.append(self.cover_picture)
+
+    def set_disk_usage(self, invalidate=False):
+        def complete(key, size):
+            self.disk_usage_cache[path] = (key, size)
+            if self.card.manga.path == path:
+                self.size_on_disk_label.set_text(size)
+
+        def run():
+            # Pages are stored in chapters folders: latest mtime of manga folder and its chapters folders
+            # changes whenever a chapter or a page is added or removed
+            try:
+                key = os.stat(path).st_mtime
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            key = max(key, entry.stat().st_mtime)
+            except OSError:
+                GLib.idle_add(complete, None, '-')
+                return
+
+            if not invalidate and cached and cached[0] == key:
+                return
+
+            GLib.idle_add(complete, key, folder_size(path) or '-')
+
+        path = self.card.manga.path
+        cached = self.disk_usage_cache.get(path)
+
+        # Last known size is displayed while it's checked, computing size walks the whole manga folder, don't block UI
+        self.size_on_disk_label.set_text(cached[1] if cached else '…')
+        self.window.application.executor.submit(run)
+
+    def set_wrapbox_labels(self, wrapbox, labels, texts, css_class):
+        # Recycle existing labels, only create or remove the difference
+        for index, text in enumerate(texts):
+            if index < len(labels):
+                label = labels[index]
+            else:
+                label = Gtk.Label()
+                label.set_ellipsize(Pango.EllipsizeMode.END)
+                label.set_css_classes([css_class, 'caption'])
+                wrapbox.append(label)
+                labels.append(label)
+
+            label.set_markup(html_escape(text))
+
+        for label in labels[len(texts):]:
+            wrapbox.remove(label)
+        del labels[len(texts):]
@@ -79,6 +79,9 @@ class ChaptersList:
         self.selection_positions = []
         self.selection_click_position = None
 
+        # Scanlators filtered out (hidden) in manga chapters
+        self.excluded_scanlators = frozenset()
+
         self.factory = Gtk.SignalListItemFactory()
         self.factory.connect('bind', self.on_factory_bind)
         self.factory.connect('setup', self.on_factory_setup)
@@ -99,7 +102,6 @@ class ChaptersList:
 
         # Chapters selection mode ActionBar
         self.chapters_selection_mode_actionbar = self.card.chapters_selection_mode_actionbar
-        self.card.chapters_selection_mode_menubutton.set_menu_model(self.card.builder.get_object('menu-card-selection-mode'))
 
         # Gesture to detect long press on mouse button 1 and enter in selection mode
         self.gesture_long_press = Gtk.GestureLongPress.new()
@@ -209,6 +211,11 @@ class ChaptersList:
         self.card.leave_selection_mode()
 
     def enter_selection_mode(self, init=False):
+        if self.card.chapters_selection_mode_menubutton.get_menu_model() is None:
+            # Menu is loaded on first use only
+            self.card.builder.add_from_resource('/info/febvre/Komikku/ui/menu/card_selection_mode.xml')
+            self.card.chapters_selection_mode_menubutton.set_menu_model(self.card.builder.get_object('menu-card-selection-mode'))
+
         self.chapters_selection_mode_actionbar.set_revealed(True)
         self.listview.set_single_click_activate(False)
 
@@ -217,16 +224,17 @@ class ChaptersList:
             self.on_selection_changed(None, None, None)
 
     def filter_func(self, item: ChapterItemWrapper) -> int:
-        if not self.card.manga.filters or not self.card.manga.filters.get('scanlators'):
+        if not self.excluded_scanlators:
             # No scanlators filter
             return True
 
         if not item.chapter.scanlators:
             # Chapter has no scanlators defined
             # It is not filtered if 'Unknown' virtual scanlator does not belong to filter
-            return 'Unknown' not in self.card.manga.filters['scanlators']
+            return 'Unknown' not in self.excluded_scanlators
 
-        return len(set(item.chapter.scanlators or []).difference(set(self.card.manga.filters['scanlators']))) > 0
+        # Chapter is filtered if all its scanlators are excluded
+        return not self.excluded_scanlators.issuperset(item.chapter.scanlators)
 
     def get_selected_chapters_items(self):
         items = []
@@ -352,6 +360,9 @@ class ChaptersList:
         self.set_sort_order()
 
     def populate(self):
+        filters = self.card.manga.filters
+        self.excluded_scanlators = frozenset(filters.get('scanlators', ())) if filters else frozenset()
+
         chapters = self.card.manga.chapters
         self.list_model.populate(chapters)
 
@@ -527,7 +538,7 @@ class ChaptersList:
             self.card.leave_selection_mode()
             self.card.window.add_notification(_('Failed to update chapters reading status'))
 
-    def update_chapter_item(self, _downloader=None, download=None, chapter=None):
+    def update_chapter_item(self, downloader=None, download=None, chapter=None):
         """
         Update a specific chapter row
         - used when download status change (via signal from Downloader)
@@ -548,6 +559,10 @@ class ChaptersList:
                 item.emit_changed()
                 break
 
+        if downloader is not None and download is None:
+            # Download is ended or removed, disk usage has changed
+            self.card.info_box.refresh()
+
         self.card.window.library.refresh_on_manga_state_changed(self.card.manga)
 
 
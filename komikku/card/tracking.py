@@ -2,11 +2,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Author: Valéry Febvre <vfebvre@easter-eggs.com>
 
+from collections import deque
 from gettext import gettext as _
-from queue import Empty
-from queue import Queue
 import threading
-import time
 
 from gi.repository import Adw
 from gi.repository import GLib
@@ -15,14 +13,17 @@ from gi.repository import Pango
 
 from komikku.consts import COVER_HEIGHT
 from komikku.consts import COVER_WIDTH
-from komikku.consts import DOWNLOAD_MAX_DELAY
 from komikku.consts import LOGO_SIZE
 from komikku.consts import MISSING_IMG_RESOURCE_PATH
 from komikku.utils import convert_and_resize_image
 from komikku.utils import CoverPicture
+from komikku.utils import get_cached_cover
 from komikku.utils import html_escape
 from komikku.utils import log_error_traceback
+from komikku.utils import RequestsPacer
+from komikku.utils import save_cached_cover
 
+COVERS_WORKERS = 3
 THUMB_WIDTH = 96
 THUMB_HEIGHT = 136
 
@@ -32,13 +33,13 @@ class TrackingDialog(Adw.PreferencesDialog):
     __gtype_name__ = 'TrackingDialog'
 
     group = Gtk.Template.Child('group')
-    selected_tracker_row = None
-    tracker_rows = []
 
     def __init__(self, window):
         super().__init__(follows_content_size=True)
 
         self.window = window
+        self.selected_tracker_row = None
+        self.tracker_rows = []
 
         for _id, tracker in self.window.trackers.trackers.items():
             row = TrackerRow(window, tracker)
@@ -78,16 +79,20 @@ class TrackingDialog(Adw.PreferencesDialog):
         self.selected_tracker_row.set_arrow_visible(True)
         self.selected_tracker_row.btn.set_visible(False)
 
-        thread = threading.Thread(target=run)
-        thread.daemon = True
-        thread.start()
+        self.window.application.executor.submit(run)
 
     def on_closed(self, _dialog):
+        # Save pending changes before sync
+        for tracker_row in self.tracker_rows:
+            if tracker_row.save_tracking_data_source_id is not None:
+                GLib.source_remove(tracker_row.save_tracking_data_source_id)
+                tracker_row.save_tracking_data()
+
         self.window.trackers.sync()
         self.pop_subpage()
 
     def on_search_subpage_hiding(self, _page):
-        self.search_subpage.thread_covers_stop_flag = True
+        self.search_subpage.covers_cancel_event.set()
         self.search_subpage.clear()
 
     def show(self):
@@ -108,9 +113,16 @@ class TrackingDialog(Adw.PreferencesDialog):
 
 
 class TracherResultRow(Gtk.ListBoxRow):
-    def __init__(self, window, data):
+    """
+    Row of a tracker search result
+
+    Rows are recycled from a search to another: widgets are created once and populated with each new result.
+    """
+
+    data = None
+
+    def __init__(self, window):
         self.window = window
-        self.data = data
 
         super().__init__()
 
@@ -125,72 +137,107 @@ class TracherResultRow(Gtk.ListBoxRow):
         hbox = Gtk.Box(spacing=6)
 
         vbox_details = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        title = Gtk.Label(
-            label=html_escape(data['name']),
+        self.title_label = Gtk.Label(
             use_markup=True,
             ellipsize=Pango.EllipsizeMode.END,
             xalign=0,
             hexpand=True
         )
-        title.add_css_class('title')
-        vbox_details.append(title)
-
-        if data.get('authors'):
-            label = Gtk.Label(
-                label=html_escape(data['authors']),
-                use_markup=True,
-                ellipsize=Pango.EllipsizeMode.END,
-                xalign=0,
-                hexpand=True
-            )
-            label.add_css_class('subtitle')
-            vbox_details.append(label)
-
-        details = []
-        if data.get('start_date'):
-            details.append(data['start_date'])
+        self.title_label.add_css_class('title')
+        vbox_details.append(self.title_label)
 
-        if data.get('status'):
-            details.append(data['status'])
-
-        if data.get('score'):
-            details.append(f'{data["score"]}/10')
+        self.authors_label = Gtk.Label(
+            use_markup=True,
+            ellipsize=Pango.EllipsizeMode.END,
+            xalign=0,
+            hexpand=True
+        )
+        self.authors_label.add_css_class('subtitle')
+        vbox_details.append(self.authors_label)
 
-        label = Gtk.Label(
-            label=' · '.join(details),
+        self.details_label = Gtk.Label(
             use_markup=True,
             ellipsize=Pango.EllipsizeMode.END,
             xalign=0,
             hexpand=True
         )
-        label.add_css_class('subtitle')
-        vbox_details.append(label)
+        self.details_label.add_css_class('subtitle')
+        vbox_details.append(self.details_label)
 
         hbox.append(vbox_details)
         vbox.append(hbox)
         box.append(vbox)
 
-        if data.get('synopsis'):
-            label = Gtk.Label(
-                label=html_escape(data['synopsis'].replace('\n', '')),
-                use_markup=True,
-                ellipsize=Pango.EllipsizeMode.END,
-                xalign=0,
-                hexpand=True,
-                lines=4,
-                wrap=True
-            )
-            label.add_css_class('caption')
-            vbox.append(label)
+        self.synopsis_label = Gtk.Label(
+            use_markup=True,
+            ellipsize=Pango.EllipsizeMode.END,
+            xalign=0,
+            hexpand=True,
+            lines=4,
+            wrap=True
+        )
+        self.synopsis_label.add_css_class('caption')
+        vbox.append(self.synopsis_label)
 
         self.btn = Gtk.Button(valign=Gtk.Align.START)
         self.btn.set_label(_('Track'))
-        self.btn.connect('clicked', lambda _btn: self.window.card.tracking_dialog.add_tracking(data['id']))
+        self.btn.connect('clicked', self.on_track_button_clicked)
         hbox.append(self.btn)
 
         self.set_child(box)
 
-    def set_cover(self, data):
+    @staticmethod
+    def get_labels(data):
+        """
+        Returns markups of labels of a result
+
+        Labels are computed once (in search thread) and reused if row is recycled.
+        """
+        details = []
+        if data.get('start_date'):
+            details.append(data['start_date'])
+
+        if data.get('status'):
+            details.append(data['status'])
+
+        if data.get('score'):
+            details.append(f'{data["score"]}/10')
+
+        return dict(
+            title=html_escape(data['name']),
+            authors=html_escape(data['authors']) if data.get('authors') else '',
+            details=' · '.join(details),
+            synopsis=html_escape(data['synopsis'].replace('\n', '')) if data.get('synopsis') else '',
+        )
+
+    def on_track_button_clicked(self, _button):
+        self.window.card.tracking_dialog.add_tracking(self.data['id'])
+
+    def populate(self, data):
+        self.data = data
+
+        # Cover of previous result must not remain visible until new one is fetched
+        self.cover_bin.set_child(None)
+
+        if 'labels' not in data:
+            data['labels'] = self.get_labels(data)
+        labels = data['labels']
+
+        self.title_label.set_label(labels['title'])
+
+        self.authors_label.set_label(labels['authors'])
+        self.authors_label.set_visible(bool(labels['authors']))
+
+        self.details_label.set_label(labels['details'])
+
+        self.synopsis_label.set_label(labels['synopsis'])
+        self.synopsis_label.set_visible(bool(labels['synopsis']))
+
+    def set_cover(self, data, url):
+        if self.get_parent() is None or self.data is None or url != self.data['cover']:
+            # Row has been removed or recycled (new search or search page left) since cover has been requested
+            return
+
         picture = CoverPicture.new_from_data(data, THUMB_WIDTH, THUMB_HEIGHT, True) if data else None
         if picture is None:
             picture = CoverPicture.new_from_resource(MISSING_IMG_RESOURCE_PATH, THUMB_WIDTH, THUMB_HEIGHT)
@@ -199,6 +246,9 @@ class TracherResultRow(Gtk.ListBoxRow):
 
 
 class TrackerRow(Adw.ExpanderRow):
+    save_tracking_data_source_id = None
+    title_key = None
+
     def __init__(self, window, tracker):
         self.window = window
         self.tracker = tracker
@@ -207,6 +257,13 @@ class TrackerRow(Adw.ExpanderRow):
 
         self.set_logo()
 
+        # Expander arrow is not exposed by Adw.ExpanderRow, look it up once in its internal widgets tree
+        # Tree may change with libadwaita versions: in that case, arrow is simply left as is
+        try:
+            action_row = self.get_first_child().get_first_child().get_first_child()
+            self.arrow_image = action_row.get_first_child().get_last_child().get_last_child()
+        except AttributeError:
+            self.arrow_image = None
         self.set_arrow_visible(False)
 
         self.btn = Gtk.Button(valign=Gtk.Align.CENTER)
@@ -225,10 +282,7 @@ class TrackerRow(Adw.ExpanderRow):
 
         # Status
         self.status_row = Adw.ComboRow(title=_('Status'))
-        statuses = Gtk.StringList()
-        for _status, internal_status in self.tracker.STATUSES_MAPPING.items():
-            statuses.append(_(self.tracker.INTERNAL_STATUSES[internal_status]))
-        self.status_row.set_model(statuses)
+        self.status_row.set_model(Gtk.StringList.new(self.tracker.statuses_labels))
         self.status_changed_handler_id = self.status_row.connect('notify::selected', self.update_tracking_data)
         self.add_row(self.status_row)
 
@@ -258,23 +312,15 @@ class TrackerRow(Adw.ExpanderRow):
         )
 
     def get_logo(self):
-        def run():
-            try:
-                res = self.tracker.save_logo()
-            except Exception:
-                res = False
-
-            GLib.idle_add(complete, res)
-
         def complete(res):
             if not res:
                 self.window.application.logger.info('Failed to get `%s` tracker logo', self.tracker.id)
 
             self.set_logo(use_fallback=True)
 
-        thread = threading.Thread(target=run)
-        thread.daemon = True
-        thread.start()
+        # Logo is usually already prefetched (or being fetched) by trackers manager
+        future = self.window.trackers.fetch_logo(self.tracker)
+        future.add_done_callback(lambda future: GLib.idle_add(complete, not future.cancelled() and future.result()))
 
     def init(self, data=None):
         def run():
@@ -302,31 +348,25 @@ class TrackerRow(Adw.ExpanderRow):
             self.set_subtitle('')
             self.btn.set_visible(False)
 
-            if data.get('url'):
-                tracker_manga_url = data['url']
-            else:
-                tracker_manga_url = self.tracker.get_manga_url(data['id'])
-            self.action_row.set_title(f'<a href="{tracker_manga_url}">{html_escape(data["name"])}</a>')
+            # Title only depends on tracker manga ID, URL and name
+            title_key = (data['id'], data.get('url'), data['name'])
+            if title_key != self.title_key:
+                tracker_manga_url = data['url'] if data.get('url') else self.tracker.get_manga_url(data['id'])
+                self.action_row.set_title(f'<a href="{tracker_manga_url}">{html_escape(data["name"])}</a>')
+                self.title_key = title_key
 
+            # Rows adjustments are reused, only reconfigured (value, lower, upper, step increment, page increment, page size)
             with self.chapters_progress_row.handler_block(self.num_chapter_changed_handler_id):
-                adj = Gtk.Adjustment(
-                    value=float(data['chapters_progress']) or 0,
-                    lower=0,
-                    upper=data['chapters'] or 10000,
-                    step_increment=1,
-                    page_increment=10
+                self.chapters_progress_row.get_adjustment().configure(
+                    float(data['chapters_progress']) or 0, 0, data['chapters'] or 10000, 1, 10, 0
                 )
-                self.chapters_progress_row.set_adjustment(adj)
 
             with self.score_row.handler_block(self.score_changed_handler_id):
                 self.score_row.format = self.tracker.get_user_score_format(data['score_format'])
-                adj = Gtk.Adjustment(
-                    value=data['score'] or 0,
-                    lower=self.score_row.format['min'],
-                    upper=self.score_row.format['max'],
-                    step_increment=self.score_row.format['step'],
+                self.score_row.get_adjustment().configure(
+                    data['score'] or 0, self.score_row.format['min'], self.score_row.format['max'], self.score_row.format['step'], 0, 0
                 )
-                self.score_row.configure(adj, 0, self.score_row.format['step'] * 10 if self.score_row.format['step'] != 1 else 0)
+                self.score_row.set_digits(self.score_row.format['step'] * 10 if self.score_row.format['step'] != 1 else 0)
 
             with self.status_row.handler_block(self.status_changed_handler_id):
                 self.status_row.set_selected(self.tracker.get_status_index(data['status']))
@@ -339,13 +379,12 @@ class TrackerRow(Adw.ExpanderRow):
             tracked = self.window.card.manga.tracking and self.window.card.manga.tracking.get(self.tracker.id)
 
             if access_token_valid and tracked:
-                thread = threading.Thread(target=run)
-                thread.daemon = True
-                thread.start()
+                self.window.application.executor.submit(run)
             else:
                 self.set_expanded(False)
                 self.set_enable_expansion(False)
                 self.action_row.set_title('')
+                self.title_key = None
 
                 if access_token_valid:
                     self.set_arrow_visible(False)
@@ -366,10 +405,17 @@ class TrackerRow(Adw.ExpanderRow):
         self.window.card.tracking_dialog.show_search(self.tracker)
         self.window.card.tracking_dialog.selected_tracker_row = self
 
+    def save_tracking_data(self):
+        self.save_tracking_data_source_id = None
+
+        manga = self.window.card.manga
+        manga.update({'tracking': manga.tracking})
+
+        return GLib.SOURCE_REMOVE
+
     def set_arrow_visible(self, visible):
-        action_row = self.get_first_child().get_first_child().get_first_child()
-        arrow_img = action_row.get_first_child().get_last_child().get_last_child()
-        arrow_img.set_visible(visible)
+        if self.arrow_image is not None:
+            self.arrow_image.set_visible(visible)
 
     def set_logo(self, use_fallback=False):
         if self.tracker.logo_url:
@@ -396,12 +442,20 @@ class TrackerRow(Adw.ExpanderRow):
             'chapters_progress': self.chapters_progress_row.get_value(),
             'score': self.score_row.get_value() * self.score_row.format['raw_factor'],  # RAW
             'status': self.tracker.get_status_from_index(self.status_row.get_selected()),
-            '_synced': False,
         }
 
-        manga = self.window.card.manga
-        manga.tracking[self.tracker.id].update(data)
-        manga.update({'tracking': manga.tracking})
+        tracking = self.window.card.manga.tracking[self.tracker.id]
+        if all(tracking.get(key) == value for key, value in data.items()):
+            # Values are unchanged (e.g. spin row set back to its value), nothing to save or sync
+            return
+
+        data['_synced'] = False
+        tracking.update(data)
+
+        # Coalesce bursts of changes (spin rows) in a single save
+        if self.save_tracking_data_source_id is not None:
+            GLib.source_remove(self.save_tracking_data_source_id)
+        self.save_tracking_data_source_id = GLib.timeout_add(200, self.save_tracking_data)
 
 
 @Gtk.Template.from_resource('/info/febvre/Komikku/ui/card_tracking_search.ui')
@@ -417,9 +471,11 @@ class TrackingSearchSubPage(Adw.NavigationPage):
         super().__init__()
 
         self.window = window
-        self.queue = Queue()
-        self.thread_covers = None
-        self.thread_covers_stop_flag = False
+        self.covers_cancel_event = threading.Event()
+        self.covers_pacers = {}
+        self.covers_workers = []
+        self.pending_rows = deque()
+        self.search_id = 0
 
         self.tracker = None
 
@@ -427,21 +483,9 @@ class TrackingSearchSubPage(Adw.NavigationPage):
         self.searchentry.connect('search-changed', self.on_search_changed)
 
     def clear(self):
-        # Empty queue
-        while not self.queue.empty():
-            try:
-                self.queue.get()
-                self.queue.task_done()
-            except Empty:
-                continue
-
-        # Empty group
-        row = self.listbox.get_first_child()
-        while row:
-            next_row = row.get_next_sibling()
-
-            self.listbox.remove(row)
-            row = next_row
+        # Drop rows whose cover has not been fetched yet
+        # Rows themselves are kept, they will be recycled by next search
+        self.pending_rows.clear()
 
     def init(self, tracker, name=None):
         self.tracker = tracker
@@ -452,7 +496,11 @@ class TrackingSearchSubPage(Adw.NavigationPage):
         self.search()
 
     def on_search_changed(self, _entry):
+        # `search-changed` is already delayed by Gtk.SearchEntry while typing, search itself is only run on activation
         if not self.searchentry.get_text().strip():
+            # Drop results of an in-flight search and pending covers, intro must stay visible
+            self.search_id += 1
+            self.clear()
             self.stack.set_visible_child_name('intro')
 
     def render_covers(self):
@@ -461,48 +509,95 @@ class TrackingSearchSubPage(Adw.NavigationPage):
 
         This method is interrupted when the navigation page is left.
         """
-        def run():
-            while not self.queue.empty() and self.thread_covers_stop_flag is False:
+        def run(cancel_event):
+            while not cancel_event.is_set():
                 try:
-                    row = self.queue.get()
-                except Empty:
-                    continue
+                    # Rows are shared by several workers, popleft() is atomic
+                    row = self.pending_rows.popleft()
+                except IndexError:
+                    break
                 else:
+                    if (result := row.data) is None:
+                        # Row has been removed from list in the meantime
+                        continue
+
+                    url = result['cover']
+                    if url and (data := get_cached_cover(url)):
+                        GLib.idle_add(row.set_cover, data, url)
+                        continue
+
+                    # Workers can outlive a search, use pacer of current tracker
+                    pacer = self.covers_pacers[self.tracker.id]
+                    if not pacer.wait(cancel_event):
+                        # Pending rows are cleared on cancel, they are refilled by next search
+                        break
+
                     try:
-                        data, _etag, rtime = self.tracker.get_image(row.data['cover'])
+                        data, _etag, rtime = self.tracker.get_image(url)
+                        pacer.update(rtime)
                         # Covers in landscape format are converted to portrait format
                         data = convert_and_resize_image(data, COVER_WIDTH, COVER_HEIGHT)
                     except Exception:
                         pass
                     else:
-                        GLib.idle_add(row.set_cover, data)
-
-                        if rtime:
-                            time.sleep(min(2 * rtime, DOWNLOAD_MAX_DELAY))
-
-                    self.queue.task_done()
-
-        self.thread_covers_stop_flag = False
-        self.thread_covers = threading.Thread(target=run)
-        self.thread_covers.daemon = True
-        self.thread_covers.start()
+                        if data:
+                            save_cached_cover(url, data)
+                        GLib.idle_add(row.set_cover, data, url)
+
+        # Covers are fetched by a few concurrent workers, requests to a tracker are spaced out by a shared pacer
+        if self.tracker.id not in self.covers_pacers:
+            self.covers_pacers[self.tracker.id] = RequestsPacer()
+
+        if self.covers_cancel_event.is_set():
+            # Cancelled workers are exiting, they must not be counted: start a new set bound to a new event
+            self.covers_cancel_event = threading.Event()
+            self.covers_workers = []
+
+        # Workers still alive process pending rows too, only start missing ones (never more than rows to process)
+        self.covers_workers = [thread for thread in self.covers_workers if thread.is_alive()]
+        for _index in range(min(COVERS_WORKERS - len(self.covers_workers), len(self.pending_rows))):
+            thread = threading.Thread(target=run, args=(self.covers_cancel_event,))
+            thread.daemon = True
+            thread.start()
+            self.covers_workers.append(thread)
 
     def search(self):
-        def run(term):
+        def run(term, search_id):
             try:
                 results = self.tracker.search(term)
             except Exception as e:
                 log_error_traceback(e)
                 results = None
+            else:
+                # Prepare rows labels out of main thread
+                for result in results or []:
+                    result['labels'] = TracherResultRow.get_labels(result)
+
+            GLib.idle_add(complete, results, search_id)
 
-            GLib.idle_add(complete, results)
+        def complete(results, search_id):
+            if search_id != self.search_id:
+                # A newer search has been started, drop stale results
+                return
 
-        def complete(results):
             if results:
+                # Recycle rows of previous search, create missing ones
+                row = self.listbox.get_first_child()
                 for result in results:
-                    row = TracherResultRow(self.window, result)
-                    self.listbox.append(row)
-                    self.queue.put(row)
+                    if row is None:
+                        row = TracherResultRow(self.window)
+                        self.listbox.append(row)
+
+                    row.populate(result)
+                    self.pending_rows.append(row)
+                    row = row.get_next_sibling()
+
+                # Remove rows in excess
+                while row:
+                    next_row = row.get_next_sibling()
+                    self.listbox.remove(row)
+                    row.data = None
+                    row = next_row
 
                 self.stack.set_visible_child_name('results')
                 self.render_covers()
@@ -520,7 +615,6 @@ class TrackingSearchSubPage(Adw.NavigationPage):
         self.stack.set_visible_child_name('loading')
 
         term = self.searchentry.get_text().strip()
+        self.search_id += 1
 
-        self.thread = threading.Thread(target=run, args=(term,))
-        self.thread.daemon = True
-        self.thread.start()
+        self.window.application.executor.submit(run, term, self.search_id)
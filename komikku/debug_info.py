@@ -27,6 +27,9 @@ class DebugInfo:
     def __init__(self, app):
         self.app = app
 
+        # Collected here, GTK must be accessed from main thread only, while `generate` can be called from any thread
+        self.gtk_info = self.get_gtk_info()
+
     def get_flatpak_info(self):
         path = os.path.join(GLib.get_user_runtime_dir(), 'flatpak-info')
         if not os.path.exists(path):
@@ -140,7 +143,7 @@ class DebugInfo:
             info += f'- Devel: {flatpak_info["devel"]}\n'
             info += '\n'
 
-        gtk_info = self.get_gtk_info()
+        gtk_info = self.gtk_info
         info += 'GTK:\n'
         info += f"- GDK backend: {gtk_info['backend']}\n"
         info += f"- GSK renderer: {gtk_info['renderer']}\n"
@@ -2,12 +2,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Author: Valéry Febvre <vfebvre@easter-eggs.com>
 
+from collections import deque
+from concurrent.futures import Future
+from functools import cache
+from functools import partial
 from gettext import gettext as _
 from gettext import ngettext
-from queue import Empty
-from queue import Queue
 import threading
-import time
 
 from gi.repository import Adw
 from gi.repository import GLib
@@ -16,15 +17,20 @@ from gi.repository import Pango
 
 from komikku.consts import COVER_HEIGHT
 from komikku.consts import COVER_WIDTH
-from komikku.consts import DOWNLOAD_MAX_DELAY
 from komikku.consts import LOGO_SIZE
 from komikku.consts import MISSING_IMG_RESOURCE_PATH
 from komikku.models import Settings
 from komikku.servers import LANGUAGES
+from komikku.servers.utils import get_server_main_id_by_id
 from komikku.utils import convert_and_resize_image
 from komikku.utils import CoverPicture
+from komikku.utils import get_cached_cover
 from komikku.utils import html_escape
+from komikku.utils import RequestsPacer
+from komikku.utils import save_cached_cover
 
+COVERS_WORKERS = 3
+LOGOS_WORKERS = 4
 THUMB_WIDTH = 41
 THUMB_HEIGHT = 58
 
@@ -32,74 +38,204 @@ THUMB_HEIGHT = 58
 class ExplorerSearchStackPage:
     """ Superclass for search, latest updates, most popular and global search pages """
 
+    # Shared by all pages
+    covers_inflight = {}
+    covers_inflight_lock = threading.Lock()
+    covers_pacers = {}
+    covers_servers_locks = {}
+
     def __init__(self, parent):
         self.parent = parent
         self.window = self.parent.window
 
-        self.queue = Queue()
+        self.covers_cancel_event = threading.Event()
+        self.covers_lock = threading.Lock()
+        self.covers_source_id = None
+        self.covers_workers_count = 0
+        self.covers_workers_lock = threading.Lock()
+        self.fetched_covers = deque()
+        self.pending_covers = []
+        self.queue = deque()
+        self.scrolledwindow = None
         self.status = None
-        self.thread_covers = None
-        self.thread_covers_stop_flag = False
+
+    def add_fetched_cover(self, row, data):
+        """
+        Queues a fetched cover to be displayed (called from covers thread)
+
+        Covers are displayed in batches by a single idle source instead of one idle callback per cover.
+        """
+        with self.covers_lock:
+            self.fetched_covers.append((row, data))
+            if self.covers_source_id is None:
+                self.covers_source_id = GLib.idle_add(self.set_fetched_covers)
 
     def clear(self):
         self.listbox.set_visible(False)
 
+        # Drop fetched covers not displayed yet
+        with self.covers_lock:
+            self.fetched_covers.clear()
+
         # Empty queue
-        while not self.queue.empty():
-            try:
-                self.queue.get()
-                self.queue.task_done()
-            except Empty:
-                continue
+        self.pending_covers.clear()
+        self.queue.clear()
 
-        # Empty listbox
+        # Empty listbox: rows are disposed first, then all removed at once
         row = self.listbox.get_first_child()
         while row:
-            next_row = row.get_next_sibling()
-
             if isinstance(row, (ExplorerServerRow, ExplorerSearchResultRow)):
                 row.dispose()
+            row = row.get_next_sibling()
+
+        self.listbox.remove_all()
 
-            self.listbox.remove(row)
-            row = next_row
+    def on_scrolled(self, _adjustment):
+        # Scrolling or resizing may reveal rows whose cover has not been requested yet
+        if not self.pending_covers or self.covers_cancel_event.is_set():
+            return
+
+        self.render_covers()
+
+    def queue_visible_covers(self):
+        """
+        Moves covers of rows near the visible area (one page above and below) from pending covers to queue
+
+        Covers of rows the user never scrolls to are never fetched.
+        """
+        height = self.scrolledwindow.get_height()
+        pending_covers = []
+        for index, (row, server) in enumerate(self.pending_covers):
+            if row.get_height() == 0:
+                # Row is not allocated yet
+                pending_covers.append((row, server))
+                continue
+
+            res, bounds = row.compute_bounds(self.scrolledwindow)
+            if res and bounds.origin.y > 2 * height:
+                # Rows are in display order, next ones are further down
+                pending_covers += self.pending_covers[index:]
+                break
+
+            if res and bounds.origin.y + bounds.size.height >= -height:
+                self.queue.append((row, server))
+            else:
+                pending_covers.append((row, server))
+
+        self.pending_covers = pending_covers
 
     def render_covers(self):
         """
         Fetch and display covers of result rows
 
+        Only covers of rows near the visible area are fetched, next ones are requested on scroll.
+
         This method is interrupted when the navigation page is changed.
         It can be recalled when returning to it (when last page has been popped from the navigation stack).
         Remaining items in queue will be proceeded.
         """
-        if self.thread_covers and self.thread_covers.is_alive():
-            return
+        def on_inflight_cover_done(row, server, future):
+            if future.cancelled():
+                # Request has been put on hold
+                self.queue.appendleft((row, server))
+            else:
+                # Missing image is displayed if no cover has been fetched
+                self.add_fetched_cover(row, future.result())
 
         def run():
-            while not self.queue.empty() and self.thread_covers_stop_flag is False:
-                try:
-                    row, server = self.queue.get()
-                except Empty:
+            while True:
+                # Exit is decided under lock: rows queued afterwards are always processed by a newly started worker
+                with self.covers_workers_lock:
+                    if self.covers_cancel_event.is_set() or not self.queue:
+                        self.covers_workers_count -= 1
+                        break
+
+                    row, server = self.queue.popleft()
+
+                if (manga_data := row.manga_data) is None:
+                    # Row has been disposed in the meantime
+                    continue
+
+                url = manga_data['cover']
+                if url and (data := get_cached_cover(url)):
+                    # Cover already fetched recently (browsed before or from another search)
+                    self.add_fetched_cover(row, data)
                     continue
-                else:
+
+                # Several results can share a same cover URL (global search): a single request is made
+                with self.covers_inflight_lock:
+                    if url in self.covers_inflight:
+                        self.covers_inflight[url].add_done_callback(partial(on_inflight_cover_done, row, server))
+                        continue
+
+                    future = self.covers_inflight[url] = Future()
+
+                # Requests to a same server are never concurrent and are spaced out, whatever the page and the worker
+                if server.id not in self.covers_pacers:
+                    self.covers_pacers[server.id] = RequestsPacer()
+                pacer = self.covers_pacers[server.id]
+                with self.covers_servers_locks.setdefault(server.id, threading.Lock()):
+                    # Rendering may have been interrupted while waiting for lock
+                    if self.covers_cancel_event.is_set() or not pacer.wait(self.covers_cancel_event):
+                        # Put on hold: row will be processed when rendering is resumed
+                        self.queue.appendleft((row, server))
+                        with self.covers_inflight_lock:
+                            del self.covers_inflight[url]
+                        future.cancel()
+                        continue
+
+                    data = None
                     try:
-                        data, _etag, rtime = server.get_image(row.manga_data['cover'])
+                        data, _etag, rtime = server.get_image(url)
                         if data:
                             # Covers in landscape format are converted to portrait format
                             data = convert_and_resize_image(data, COVER_WIDTH, COVER_HEIGHT)
                     except Exception:
-                        pass
+                        data = None
                     else:
-                        GLib.idle_add(row.set_cover, data)
+                        if url and data:
+                            save_cached_cover(url, data)
+                        self.add_fetched_cover(row, data)
 
                         if rtime:
-                            time.sleep(min(2 * rtime, DOWNLOAD_MAX_DELAY))
+                            pacer.update(rtime)
+                    finally:
+                        with self.covers_inflight_lock:
+                            del self.covers_inflight[url]
+                        future.set_result(data)
+
+        if self.scrolledwindow is None:
+            self.scrolledwindow = self.listbox.get_ancestor(Gtk.ScrolledWindow)
+            vadjustment = self.scrolledwindow.get_vadjustment()
+            # `changed` is emitted when results are laid out or window is resized
+            vadjustment.connect('changed', self.on_scrolled)
+            vadjustment.connect('value-changed', self.on_scrolled)
+
+        self.queue_visible_covers()
+
+        self.covers_cancel_event.clear()
+
+        # Covers are fetched by a few concurrent workers, running workers are reused
+        with self.covers_workers_lock:
+            for _index in range(min(COVERS_WORKERS - self.covers_workers_count, len(self.queue))):
+                thread = threading.Thread(target=run)
+                thread.daemon = True
+                thread.start()
+                self.covers_workers_count += 1
 
-                    self.queue.task_done()
+    def set_fetched_covers(self):
+        # A few covers per main loop iteration, to keep UI responsive when many covers arrive at once (cache hits)
+        for _index in range(8):
+            with self.covers_lock:
+                if not self.fetched_covers:
+                    self.covers_source_id = None
+                    return GLib.SOURCE_REMOVE
 
-        self.thread_covers_stop_flag = False
-        self.thread_covers = threading.Thread(target=run)
-        self.thread_covers.daemon = True
-        self.thread_covers.start()
+                row, data = self.fetched_covers.popleft()
+
+            row.set_cover(data)
+
+        return GLib.SOURCE_CONTINUE
 
 
 class ExplorerSearchResultRow(Adw.ActionRow):
@@ -353,13 +489,14 @@ NOTE: The 'unrar' or 'unar' command-line tool is required for CBR archives.""")
         self.box.prepend(self.logo)
 
 
-def get_server_default_search_filters(server):
+@cache
+def get_server_class_default_search_filters(server_class):
     filters = {}
 
-    if not server.filters:
+    if not server_class.filters:
         return filters
 
-    for filter_ in server.filters:
+    for filter_ in server_class.filters:
         if filter_['type'] == 'select' and filter_['value_type'] == 'multiple':
             filters[filter_['key']] = [option['key'] for option in filter_['options'] if option['default']]
         else:
@@ -368,15 +505,39 @@ def get_server_default_search_filters(server):
     return filters
 
 
+def get_server_default_search_filters(server):
+    # Filters are defined at class level: defaults are computed once per server class
+    # A copy is returned, values of multiple select filters (lists) may be modified by callers
+    return {
+        key: value.copy() if isinstance(value, list) else value
+        for key, value in get_server_class_default_search_filters(server.__class__).items()
+    }
+
+
 def set_missing_server_logos(listbox):
     def run():
-        row = listbox.get_first_child()
-        while row:
-            if isinstance(row, ExplorerServerRow) and row.logo is None:
-                row.get_logo()
+        while True:
+            try:
+                rows = rows_groups.popleft()
+            except IndexError:
+                break
 
-            row = row.get_next_sibling()
+            # Servers of a group share the same logo: it's fetched by the first row, next ones find it on disk
+            for row in rows:
+                row.get_logo()
 
-    thread = threading.Thread(target=run)
-    thread.daemon = True
-    thread.start()
+    # Rows are collected in main thread, grouped by main server (multi-languages servers share the same logo)
+    rows_by_main_id = {}
+    row = listbox.get_first_child()
+    while row:
+        if isinstance(row, ExplorerServerRow) and row.logo is None:
+            rows_by_main_id.setdefault(get_server_main_id_by_id(row.server_data['id']), []).append(row)
+
+        row = row.get_next_sibling()
+
+    # Logos of different servers are fetched concurrently
+    rows_groups = deque(rows_by_main_id.values())
+    for _index in range(min(LOGOS_WORKERS, len(rows_groups))):
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
@@ -316,13 +316,13 @@ class ExplorerSearchPage(Adw.NavigationPage):
     def put_covers_rendering_on_hold(self):
         if self.page == 'search':
             if self.search_global_mode:
-                self.search_global_page.thread_covers_stop_flag = True
+                self.search_global_page.covers_cancel_event.set()
             else:
-                self.search_page.thread_covers_stop_flag = True
+                self.search_page.covers_cancel_event.set()
         elif self.page == 'most_popular':
-            self.most_popular_page.thread_covers_stop_flag = True
+            self.most_popular_page.covers_cancel_event.set()
         elif self.page == 'latest_updates':
-            self.latest_updates_page.thread_covers_stop_flag = True
+            self.latest_updates_page.covers_cancel_event.set()
 
     def register_request(self, page):
         if page not in self.requests:
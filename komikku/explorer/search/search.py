@@ -64,7 +64,7 @@ class ExplorerSearchStackPageSearch(ExplorerSearchStackPage):
                 row = ExplorerSearchResultRow(item)
                 self.listbox.append(row)
                 if row.has_cover:
-                    self.queue.put((row, server))
+                    self.pending_covers.append((row, server))
 
             self.stack.set_visible_child_name('results')
 
@@ -59,7 +59,9 @@ class ExplorerSearchStackPageSearchGlobal(ExplorerSearchStackPage):
                 return True
 
             self.status = 'cancelling'
-            self.window.webview.cancel_challengers(self.server_ids, context='search')
+            # No challenger can be pending if webview has never been instantiated
+            if webview := self.window.peek_page('webview'):
+                webview.cancel_challengers(self.server_ids, context='search')
 
         GLib.idle_add(do_cancel)
 
@@ -150,7 +152,7 @@ class ExplorerSearchStackPageSearchGlobal(ExplorerSearchStackPage):
                     self.listbox.append(row)
 
                     if row.has_cover:
-                        self.queue.put((row, server))
+                        self.pending_covers.append((row, server))
             else:
                 # Error, cancelled or no results
                 row = Gtk.ListBoxRow(activatable=False)
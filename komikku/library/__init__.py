@@ -233,6 +233,7 @@ class LibraryPage(Adw.NavigationPage):
         self.window.navigationview.add(self)
 
     def add_accelerators(self):
+        self.window.application.set_accels_for_action('app.add', ['<Primary>plus'])
         self.window.application.set_accels_for_action('app.library.update', ['<Primary>r'])
         self.window.application.set_accels_for_action('app.library.toggle-categories', ['F9'])
 
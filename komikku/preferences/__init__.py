@@ -13,6 +13,7 @@ from komikku.models.database import clear_cached_data
 from komikku.preferences.servers import PreferencesServersLanguagesSubPage
 from komikku.preferences.servers import PreferencesServersSettingsSubPage
 from komikku.preferences.trackers import TrackerRow
+from komikku.servers.utils import clear_allowed_servers_cache
 from komikku.utils import folder_size
 from komikku.utils import get_cached_data_dir
 from komikku.utils import get_webview_data_dir
@@ -103,15 +104,20 @@ class PreferencesDialog(Adw.PreferencesDialog):
     def on_card_backdrop_method_changed(self, row, _gparam):
         index = row.get_selected()
 
+        card = self.window.peek_page('card')
+
         if index == 0:
             self.settings.card_backdrop_method = 'none'
-            self.window.card.remove_backdrop()
+            if card:
+                card.remove_backdrop()
         elif index == 1:
             self.settings.card_backdrop_method = 'linear-gradient'
-            self.window.card.set_backdrop()
+            if card:
+                card.set_backdrop()
         elif index == 2:
             self.settings.card_backdrop_method = 'blurred-cover'
-            self.window.card.set_backdrop()
+            if card:
+                card.set_backdrop()
 
     def on_closed(self, _dialog):
         # Pop subpage if one is opened when dialog is closed
@@ -129,8 +135,8 @@ class PreferencesDialog(Adw.PreferencesDialog):
         elif index == 2:
             self.settings.color_scheme = 'default'
 
+        # Card backdrop opacity follows StyleManager `dark` property
         self.window.init_theme()
-        self.window.card.set_backdrop()
 
     def on_clamp_size_changed(self, adjustment):
         self.settings.clamp_size = int(adjustment.get_value())
@@ -215,6 +221,7 @@ class PreferencesDialog(Adw.PreferencesDialog):
         active = switch_button.get_active()
         self.advanced_banner.set_revealed(active != self.external_servers_modules_in_use)
         self.settings.external_servers_modules = active
+        clear_allowed_servers_cache()
 
     def on_fullscreen_changed(self, switch_button, _gparam):
         self.settings.fullscreen = switch_button.get_active()
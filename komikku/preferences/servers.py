@@ -254,8 +254,8 @@ class PreferencesServersLanguagesSubPage(Adw.NavigationPage):
             self.settings.remove_servers_language(code)
 
         # Update Explorer servers page
-        if self.window.explorer.servers_page in self.window.navigationview.get_navigation_stack():
-            self.window.explorer.servers_page.populate()
+        if (explorer := self.window.peek_page('explorer')) and explorer.servers_page in self.window.navigationview.get_navigation_stack():
+            explorer.servers_page.populate()
 
     def populate(self, *args):
         self.clear()
@@ -300,15 +300,15 @@ class PreferencesServersSettingsSubPage(Adw.NavigationPage):
             self.settings.toggle_server(server_main_id, row.get_active())
 
         # Update explorer servers page
-        if self.window.explorer.servers_page in self.window.navigationview.get_navigation_stack():
-            self.window.explorer.servers_page.populate()
+        if (explorer := self.window.peek_page('explorer')) and explorer.servers_page in self.window.navigationview.get_navigation_stack():
+            explorer.servers_page.populate()
 
     def on_server_language_activated(self, switch_button, _gparam, server_main_id, lang):
         self.settings.toggle_server_lang(server_main_id, lang, switch_button.get_active())
 
         # Update explorer servers page
-        if self.window.explorer.servers_page in self.window.navigationview.get_navigation_stack():
-            self.window.explorer.servers_page.populate()
+        if (explorer := self.window.peek_page('explorer')) and explorer.servers_page in self.window.navigationview.get_navigation_stack():
+            explorer.servers_page.populate()
 
     def populate(self, *args):
         settings = self.settings.servers_settings
@@ -270,16 +270,18 @@ class ReaderPage(Adw.NavigationPage):
         self.page_numbering_label.set_visible(False)
         self.window.unfullscreen()
 
+        navigation_stack = self.window.navigationview.get_navigation_stack()
+
         # Sync Card page
-        if self.window.card in self.window.navigationview.get_navigation_stack():
+        if (card := self.window.peek_page('card')) and card in navigation_stack:
             if self.chapters_consulted:
                 # Refresh to update all previously chapters consulted (last page read may have changed also)
                 # and update info like disk usage
-                self.window.card.refresh(unread_chapters=True, info=True, chapters=self.chapters_consulted)
+                card.refresh(unread_chapters=True, info=True, chapters=self.chapters_consulted)
 
         # Sync History page
-        if self.window.history in self.window.navigationview.get_navigation_stack():
-            self.window.history.populate()
+        if (history := self.window.peek_page('history')) and history in navigation_stack:
+            history.populate()
 
         # Sync Library page (root)
         if self.manga.in_library:
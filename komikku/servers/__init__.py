@@ -28,6 +28,7 @@ from komikku.models.settings import Settings
 from komikku.servers.exceptions import ServerException
 from komikku.servers.loader import ServerFinder
 from komikku.servers.loader import ServerFinderPriority
+from komikku.servers.utils import clear_allowed_servers_cache
 from komikku.servers.utils import get_server_main_id_by_id
 from komikku.utils import BaseServer
 from komikku.utils import get_cache_dir
@@ -437,6 +438,9 @@ def init_servers_modules(use_external_servers_modules, reload_modules=False):
         server_finder.add_path(os.path.join(get_cache_dir(), 'servers/repo'))
         server_finder.install()
 
+    # Servers classes indexed by URL may come from previously loaded modules
+    clear_allowed_servers_cache()
+
 
 def install_servers_modules_from_repo(app_version):
     """
@@ -495,6 +499,8 @@ def install_servers_modules_from_repo(app_version):
 
                 zip.extract(zip_info, dest_path)
 
+        clear_allowed_servers_cache()
+
         return True, 'updated' if current_hash else 'created'
 
     if not os.path.exists(dest_path) or not os.path.exists(index_path):
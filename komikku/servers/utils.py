@@ -3,6 +3,7 @@
 # Author: Valéry Febvre <vfebvre@easter-eggs.com>
 
 import datetime
+from functools import lru_cache
 from functools import wraps
 import glob
 import importlib
@@ -19,6 +20,7 @@ import re
 import struct
 import sys
 import time
+from urllib.parse import urlsplit
 
 from bs4 import BeautifulSoup
 from bs4 import NavigableString
@@ -73,6 +75,11 @@ class TextImage:
         return f'image/{self.format}'
 
 
+def clear_allowed_servers_cache():
+    """Clears allowed servers index, must be called whenever servers modules are (re)loaded or updated"""
+    _get_allowed_servers_index.cache_clear()
+
+
 def convert_date_string(date_string, format=None, languages=None):
     """
     Convert a date string into a date object
@@ -184,6 +191,69 @@ def do_login(func):
     return wrapper
 
 
+@lru_cache(maxsize=4)
+def _get_allowed_servers_index(settings, _fingerprint):
+    """
+    Returns allowed servers indexed by base URL host, then grouped by base URL
+
+    Each host entry is a list of (base_url, servers) tuples sorted by descending base URL length,
+    where `servers` is the list of (server_data, server_class) tuples sharing this base URL (multi-languages servers).
+    `_fingerprint` is only used as cache key, it must change whenever servers related settings change.
+    """
+    groups = {}
+    for server_data in get_allowed_servers_list(settings):
+        server_class = getattr(server_data['module'], server_data['class_name'])
+        if not server_class.base_url:
+            continue
+
+        groups.setdefault(server_class.base_url, []).append((server_data, server_class))
+
+    index = {}
+    for base_url in sorted(groups, key=len, reverse=True):
+        index.setdefault(urlsplit(base_url).netloc, []).append((base_url, groups[base_url]))
+
+    return index
+
+
+def get_allowed_servers_by_url(settings, url):
+    """
+    Returns allowed servers able to handle an URL
+
+    Parameters
+    ----------
+    :param settings: Settings instance
+    :type settings: Settings
+
+    :param url: An URL
+    :type url: str
+
+    :return: List of (server_data, server_class) tuples for which server base URL is a prefix of URL
+    :rtype: list
+    """
+    host = urlsplit(url).netloc
+    if not host:
+        # Not an URL (or a relative one), no need to build index
+        return []
+
+    fingerprint = (
+        settings.get_string('servers-settings'),
+        tuple(settings.servers_languages),
+        settings.nsfw_content,
+        settings.nsfw_only_content,
+        settings.external_servers_modules,
+    )
+
+    servers = []
+    for base_url, base_url_servers in _get_allowed_servers_index(settings, fingerprint).get(host, ()):
+        if not url.startswith(base_url):
+            continue
+
+        # Return copies, indexed data must not be altered by callers
+        servers += [(server_data.copy(), server_class) for server_data, server_class in base_url_servers]
+
+    return servers
+
+
 def get_allowed_servers_list(settings):
     servers_settings = settings.servers_settings
     servers_languages = settings.servers_languages
@@ -4,6 +4,7 @@
 
 from abc import ABC
 from abc import abstractmethod
+from functools import cached_property
 from functools import wraps
 from gettext import gettext as _
 import json
@@ -73,10 +74,18 @@ class Tracker(BaseServer, ABC):
     }
     STATUSES_MAPPING: dict = None
 
+    # Cache of tracker data, settings are only modified via `data` setter
+    _data = None
+    _data_loaded = False
+
     @property
     def data(self):
         """Tracker data saved in settings"""
-        return Settings.get_default().trackers.get(self.id)
+        if not self._data_loaded:
+            self._data = Settings.get_default().trackers.get(self.id)
+            self._data_loaded = True
+
+        return self._data
 
     @data.setter
     def data(self, data):
@@ -87,6 +96,9 @@ class Tracker(BaseServer, ABC):
 
         Settings.get_default().trackers = trackers
 
+        self._data = data
+        self._data_loaded = True
+
     @property
     def logo_path(self):
         path = os.path.join(get_cached_logos_dir(), 'trackers', f'{self.id}.png')
@@ -95,6 +107,16 @@ class Tracker(BaseServer, ABC):
 
         return path
 
+    @cached_property
+    def statuses(self):
+        """Internal statuses, in tracker order"""
+        return tuple(self.STATUSES_MAPPING.values())
+
+    @cached_property
+    def statuses_labels(self):
+        """Labels of internal statuses (already translated), in tracker order"""
+        return tuple(self.INTERNAL_STATUSES[status] for status in self.statuses)
+
     def convert_internal_status(self, status):
         """Returns corresponding tracker status for an internal status"""
         for tracker_status, internal_status in self.STATUSES_MAPPING.items():
@@ -118,12 +140,11 @@ class Tracker(BaseServer, ABC):
         """Returns manga URL"""
 
     def get_status_from_index(self, index):
-        return list(self.STATUSES_MAPPING.values())[index]
+        return self.statuses[index]
 
     def get_status_index(self, internal_status):
-        for index, status in enumerate(self.STATUSES_MAPPING.values()):
-            if status == internal_status:
-                return index
+        if internal_status in self.statuses:
+            return self.statuses.index(internal_status)
 
     @abstractmethod
     def get_tracker_manga_data(self, id):
@@ -199,11 +220,44 @@ class Trackers(GObject.GObject):
         super().__init__()
         self.window = window
 
+        self.logos_futures = {}
         self.trackers = {}
         for info in get_trackers_list():
             tracker = getattr(info['module'], info['class_name'])()
             self.trackers[tracker.id] = tracker
 
+    def fetch_logo(self, tracker):
+        """Fetches tracker logo in background, a single request is made even if called several times
+
+        Returned future is resolved with True on success.
+        """
+        def run():
+            try:
+                res = tracker.save_logo()
+            except Exception as e:
+                res = False
+                log_error_traceback(e)
+
+            if not res:
+                # Allow a new attempt
+                self.logos_futures.pop(tracker.id, None)
+
+            return res
+
+        if tracker.id not in self.logos_futures:
+            self.logos_futures[tracker.id] = self.window.application.executor.submit(run)
+
+        return self.logos_futures[tracker.id]
+
+    def fetch_logos(self):
+        """Prefetches all missing logos, requests run concurrently"""
+        if not Settings.get_default().tracking:
+            return
+
+        for tracker in self.trackers.values():
+            if tracker.logo_url and not tracker.logo_path:
+                self.fetch_logo(tracker)
+
     def sync(self):
         def run():
             db_conn = create_db_connection()
@@ -22,6 +22,8 @@ class Updater(GObject.GObject):
     Mangas updater
     """
     __gsignals__ = {
+        'manga-update-ended': (GObject.SignalFlags.RUN_FIRST, None, (int, )),
+        'manga-update-started': (GObject.SignalFlags.RUN_FIRST, None, (int, )),
         'manga-updated': (GObject.SignalFlags.RUN_FIRST, None, (GObject.TYPE_PYOBJECT, GObject.TYPE_PYOBJECT, bool)),
     }
 
@@ -90,6 +92,7 @@ class Updater(GObject.GObject):
                     continue
 
                 self.current_id = manga_id
+                GLib.idle_add(self.emit, 'manga-update-started', manga_id)
                 try:
                     success, chapters_changes, synced = manga.update_full(db_conn=db_conn)
                     if success:
@@ -105,6 +108,8 @@ class Updater(GObject.GObject):
                     total_errors += 1
                     GLib.idle_add(error, manga, user_error_message)
 
+                GLib.idle_add(self.emit, 'manga-update-ended', manga_id)
+
             db_conn.close()
 
             self.current_id = None
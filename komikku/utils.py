@@ -2,22 +2,30 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Author: Valéry Febvre <vfebvre@easter-eggs.com>
 
+from collections import OrderedDict
 import datetime
 from functools import cache
 from functools import cached_property
 from functools import wraps
 from gettext import gettext as _
+import hashlib
 import html
 from io import BytesIO
 import logging
 import os
 import re
 import subprocess
+import threading
+import time
 import traceback
 
 import gi
 from PIL import Image
 import magic
+try:
+    import pyvips
+except Exception:
+    pyvips = None
 import requests
 from requests.adapters import HTTPAdapter
 from requests.adapters import TimeoutSauce
@@ -36,8 +44,16 @@ from gi.repository import Gtk
 from gi.repository.GdkPixbuf import Pixbuf
 from gi.repository.GdkPixbuf import PixbufAnimation
 
+from komikku.consts import DOWNLOAD_MAX_DELAY
 from komikku.consts import REQUESTS_TIMEOUT
 
+COVERS_CACHE_MAX_AGE = 7 * 24 * 3600  # in seconds
+COVERS_MEMORY_CACHE_SIZE = 256
+
+# Most recently used covers, kept in memory to avoid disk reads on repeated searches
+covers_memory_cache = OrderedDict()
+covers_memory_cache_lock = threading.Lock()
+
 logger = logging.getLogger('komikku')
 logging.getLogger('PIL.Image').propagate = False
 logging.getLogger('PIL.PngImagePlugin').propagate = False
@@ -110,6 +126,27 @@ def convert_and_resize_image(buffer, width, height, keep_aspect_ratio=True, domi
     if img.format in ('GIF', 'WEBP') and img.is_animated:
         return buffer
 
+    old_width, old_height = img.size
+    if img.format == format and (old_width, old_height) == (width, height):
+        # Already in expected format and size (cover previously resized by Komikku for ex.), nothing to do
+        return buffer
+
+    if pyvips is not None and not (keep_aspect_ratio and old_width >= old_height):
+        # libvips (optional) decodes and resizes in a single pass using shrink-on-load: faster and far less memory
+        # Falls back to Pillow for formats it doesn't support (ICO for ex.)
+        try:
+            vimg = pyvips.Image.thumbnail_buffer(buffer, width, height=height, size='force')
+            if format == 'JPEG':
+                return vimg.write_to_buffer('.jpg', Q=90)
+
+            return vimg.write_to_buffer(f'.{format.lower()}')
+        except pyvips.Error as exc:
+            logger.debug('Failed to resize image (libvips)', exc_info=exc)
+
+    # Let JPEG decoder downscale (by a power of 2) while keeping image larger than target size
+    # Decoding is much faster and resizing has far fewer pixels to process (no-op for other formats)
+    img.draft(img.mode, (width, height))
+
     old_width, old_height = img.size
     if keep_aspect_ratio and old_width >= old_height:
         img = remove_alpha(img)
@@ -182,6 +219,55 @@ def get_cache_dir():
     return cache_dir_path
 
 
+def get_cached_cover(url):
+    """
+    Returns a cover image previously stored in covers cache
+
+    :param url: Cover image URL
+    :type url: str
+
+    :return: Image data or None if not in cache
+    :rtype: bytes
+    """
+    key = hashlib.sha256(url.encode()).hexdigest()
+    with covers_memory_cache_lock:
+        if (data := covers_memory_cache.get(key)) is not None:
+            covers_memory_cache.move_to_end(key)
+            return data
+
+    path = os.path.join(get_cached_covers_dir(), key)
+    try:
+        with open(path, 'rb') as fp:
+            data = fp.read()
+        # Keep recently used covers in cache
+        os.utime(path)
+    except OSError:
+        return None
+
+    set_memory_cached_cover(key, data)
+
+    return data
+
+
+@cache
+def get_cached_covers_dir():
+    dir_path = os.path.join(get_cache_dir(), 'covers')
+    if not os.path.exists(dir_path):
+        os.mkdir(dir_path)
+        return dir_path
+
+    # Evict covers not used recently
+    now = time.time()
+    for entry in os.scandir(dir_path):
+        try:
+            if now - entry.stat().st_mtime > COVERS_CACHE_MAX_AGE:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+    return dir_path
+
+
 @cache
 def get_cached_data_dir():
     dir_path = os.path.join(get_cache_dir(), 'tmp')
@@ -281,6 +367,16 @@ def get_image_info(path_or_bytes):
     return info
 
 
+@cache
+def get_resource_texture(path):
+    """
+    Returns a texture of an image resource
+
+    Textures are immutable, the same one is shared by all users of a resource (missing image for ex.)
+    """
+    return Gdk.Texture.new_from_resource(path)
+
+
 def get_response_elapsed(r):
     """
     Returns the response time (in seconds) of a request
@@ -307,6 +403,10 @@ def get_webview_data_dir():
 
 
 def html_escape(s):
+    # Fast path: most strings (titles, names,...) contain nothing to unescape or escape
+    if '&' not in s and '<' not in s and '>' not in s:
+        return s
+
     return html.escape(html.unescape(s), quote=False)
 
 
@@ -400,6 +500,38 @@ def retry_session(session=None, retries=3, allowed_methods=['GET'], backoff_fact
     return session
 
 
+def save_cached_cover(url, data):
+    """
+    Stores a cover image in covers cache
+
+    :param url: Cover image URL
+    :type url: str
+
+    :param data: Image data
+    :type data: bytes
+    """
+    key = hashlib.sha256(url.encode()).hexdigest()
+    set_memory_cached_cover(key, data)
+
+    path = os.path.join(get_cached_covers_dir(), key)
+    # Write atomically: covers may be read at the same time by other workers
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as fp:
+            fp.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def set_memory_cached_cover(key, data):
+    with covers_memory_cache_lock:
+        covers_memory_cache[key] = data
+        covers_memory_cache.move_to_end(key)
+        if len(covers_memory_cache) > COVERS_MEMORY_CACHE_SIZE:
+            covers_memory_cache.popitem(last=False)
+
+
 def skip_past(haystack, needle):
     if (idx := haystack.find(needle)) >= 0:
         return idx + len(needle)
@@ -647,7 +779,7 @@ class CoverLoader(GObject.GObject):
     @classmethod
     def new_from_resource(cls, path, width=None, height=None):
         try:
-            texture = Gdk.Texture.new_from_resource(path)
+            texture = get_resource_texture(path)
         except Exception:
             # Invalid image, corrupted image, unsupported image format,...
             return None
@@ -770,3 +902,46 @@ class CoverPicture(Gtk.Picture):
         self.disconnect_by_func(self.on_unrealize)
 
         self.get_paintable().dispose()
+
+
+class RequestsPacer:
+    """
+    Spaces out requests sent to a server by one or several workers
+
+    Delay between the starts of two requests adapts to the last server response time
+    (multiplied by `factor`, same rule as downloader).
+    """
+
+    def __init__(self, max_delay=DOWNLOAD_MAX_DELAY, factor=2):
+        self.delay = 0
+        self.factor = factor
+        self.lock = threading.Lock()
+        self.max_delay = max_delay
+        self.next_time = 0
+
+    def update(self, rtime):
+        if rtime is not None:
+            self.delay = min(self.factor * rtime, self.max_delay)
+
+    def wait(self, cancel_event=None):
+        """
+        Blocks until next request can be sent
+
+        :param cancel_event: Optional event interrupting the wait as soon as it's set
+        :type cancel_event: threading.Event
+
+        :return: False if the wait has been interrupted, True otherwise
+        :rtype: bool
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.next_time > now:
+                if cancel_event is None:
+                    time.sleep(self.next_time - now)
+                elif cancel_event.wait(self.next_time - now):
+                    return False
+                now = self.next_time
+
+            self.next_time = now + self.delay
+
+        return True